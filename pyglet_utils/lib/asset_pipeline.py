@@ -0,0 +1,219 @@
+from __future__ import annotations
+from typing import List, Dict, Tuple
+import os
+import json
+import fnmatch
+import argparse
+import pyglet
+from pyglet.image import AbstractImage, Texture
+
+FLIP_X_SUFFIX = '#flip_x'
+MANIFEST_VERSION = 1
+# Path of a manifest that platformer.resources installs when it is imported.
+MANIFEST_ENV_VAR = 'PYGLET_UTILS_ASSET_MANIFEST'
+
+class AssetManifest:
+    def __init__(self, atlases: List[str], regions: Dict[str, List[int]], root: str='.'):
+        # regions: name -> [atlas_idx, x, y, width, height]
+        # (x, y) is the bottom-left corner of the region in OpenGL (bottom-up) convention.
+        self.atlases = atlases
+        self.regions = regions
+        self.root = root
+        self._atlas_textures = [None] * len(atlases)
+        self._image_cache = {}
+
+    @classmethod
+    def load(cls, path: str) -> AssetManifest:
+        manifest_dict = json.load(open(path, 'r'))
+        if manifest_dict['version'] != MANIFEST_VERSION:
+            raise Exception(f"Unsupported manifest version {manifest_dict['version']} != {MANIFEST_VERSION}")
+        return AssetManifest(
+            atlases=manifest_dict['atlases'],
+            regions=manifest_dict['regions'],
+            root=os.path.dirname(os.path.abspath(path))
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'version': MANIFEST_VERSION,
+            'atlases': self.atlases,
+            'regions': self.regions
+        }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.regions
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name in self.regions.keys() if not name.endswith(FLIP_X_SUFFIX)]
+
+    def _get_atlas_texture(self, atlas_idx: int) -> Texture:
+        if self._atlas_textures[atlas_idx] is None:
+            self._atlas_textures[atlas_idx] = pyglet.image.load(
+                os.path.join(self.root, self.atlases[atlas_idx])
+            ).get_texture()
+        return self._atlas_textures[atlas_idx]
+
+    def get_image(self, name: str, flip_x: bool=False) -> AbstractImage:
+        cache_key = f'{name}{FLIP_X_SUFFIX}' if flip_x else name
+        if cache_key not in self._image_cache:
+            key = cache_key if cache_key in self.regions else name
+            if key not in self.regions:
+                raise KeyError(f"Couldn't find '{name}' in asset manifest.")
+            atlas_idx, x, y, width, height = self.regions[key]
+            img = self._get_atlas_texture(atlas_idx).get_region(x, y, width, height)
+            if flip_x and key == name:
+                img = img.get_transform(flip_x=True)
+            self._image_cache[cache_key] = img
+        return self._image_cache[cache_key]
+
+class ShelfPacker:
+    def __init__(self, width: int, height: int, padding: int=1):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+
+    def add(self, width: int, height: int) -> Tuple[int]:
+        '''Returns the top-left corner of the allocated region, or None if the atlas is full.'''
+        padded_width, padded_height = width + self.padding, height + self.padding
+        if padded_width > self.width or padded_height > self.height:
+            return None
+        if self._shelf_x + padded_width > self.width:
+            self._shelf_y += self._shelf_height
+            self._shelf_x = 0
+            self._shelf_height = 0
+        if self._shelf_y + padded_height > self.height:
+            return None
+        x, y = self._shelf_x, self._shelf_y
+        self._shelf_x += padded_width
+        self._shelf_height = max(self._shelf_height, padded_height)
+        return (x, y)
+
+def scan_assets(src_dir: str, extensions: List[str]=['.png']) -> List[str]:
+    names = []
+    for root, dirs, files in os.walk(src_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1].lower() in extensions:
+                names.append(os.path.relpath(os.path.join(root, filename), src_dir).replace(os.sep, '/'))
+    return names
+
+def build_atlases(
+    src_dir: str, dst_dir: str, atlas_size: int=1024, padding: int=1,
+    flip_patterns: List[str]=None, exclude_patterns: List[str]=None
+) -> AssetManifest:
+    from PIL import Image
+
+    flip_patterns = flip_patterns if flip_patterns is not None else []
+    exclude_patterns = exclude_patterns if exclude_patterns is not None else []
+    os.makedirs(dst_dir, exist_ok=True)
+
+    entries = []
+    for name in scan_assets(src_dir):
+        if any(fnmatch.fnmatch(name, pattern) for pattern in exclude_patterns):
+            continue
+        img = Image.open(os.path.join(src_dir, name)).convert('RGBA')
+        entries.append((name, img))
+        if any(fnmatch.fnmatch(name, pattern) for pattern in flip_patterns):
+            entries.append((f'{name}{FLIP_X_SUFFIX}', img.transpose(Image.FLIP_LEFT_RIGHT)))
+    # Tallest first keeps the shelves tight.
+    entries.sort(key=lambda entry: (entry[1].height, entry[1].width), reverse=True)
+
+    atlas_images, packers = [], []
+    atlas_regions = {}
+    for name, img in entries:
+        placed = None
+        for atlas_idx, packer in enumerate(packers):
+            pos = packer.add(img.width, img.height)
+            if pos is not None:
+                placed = (atlas_idx, pos)
+                break
+        if placed is None:
+            # Images that are larger than atlas_size get an atlas of their own.
+            packer = ShelfPacker(
+                width=max(atlas_size, img.width + padding), height=max(atlas_size, img.height + padding),
+                padding=padding
+            )
+            packers.append(packer)
+            atlas_images.append(Image.new('RGBA', (packer.width, packer.height), (0, 0, 0, 0)))
+            placed = (len(packers) - 1, packer.add(img.width, img.height))
+        atlas_idx, (x, y) = placed
+        atlas_images[atlas_idx].paste(img, (x, y))
+        atlas_regions[name] = (atlas_idx, x, y, img.width, img.height)
+
+    atlas_filenames = []
+    for atlas_idx, (atlas_img, packer) in enumerate(zip(atlas_images, packers)):
+        # Crop away unused rows at the bottom of the last shelf.
+        used_height = packer._shelf_y + packer._shelf_height
+        atlas_img = atlas_img.crop((0, 0, packer.width, used_height))
+        filename = f'atlas{atlas_idx}.png'
+        atlas_img.save(os.path.join(dst_dir, filename))
+        atlas_filenames.append(filename)
+        packer.height = used_height
+
+    regions = {}
+    for name, (atlas_idx, x, y, width, height) in atlas_regions.items():
+        # Convert from PIL (top-down) to OpenGL (bottom-up) coordinates.
+        regions[name] = [atlas_idx, x, packers[atlas_idx].height - y - height, width, height]
+    regions = {name: regions[name] for name in sorted(regions.keys())}
+    return AssetManifest(atlases=atlas_filenames, regions=regions, root=dst_dir)
+
+def write_manifest(manifest: AssetManifest, path: str):
+    json.dump(manifest.to_dict(), open(path, 'w'), separators=(',', ':'))
+
+def _to_identifier(text: str) -> str:
+    identifier = ''.join([char if char.isalnum() or char == '_' else '_' for char in text])
+    return f'_{identifier}' if identifier[:1].isdigit() else identifier
+
+def write_lookup_module(manifest: AssetManifest, path: str, manifest_path: str):
+    manifest_relpath = os.path.relpath(manifest_path, os.path.dirname(os.path.abspath(path))).replace(os.sep, '/')
+    groups = {}
+    for name in manifest.names:
+        group = _to_identifier(name.split('/')[0]) if '/' in name else 'Root'
+        attr = _to_identifier(os.path.splitext(os.path.basename(name))[0])
+        groups.setdefault(group, []).append((attr, name))
+    lines = [
+        '# Generated by pyglet_utils.lib.asset_pipeline. Do not edit.',
+        'import os',
+        'from pyglet_utils.lib.asset_pipeline import AssetManifest',
+        '',
+        f"manifest = AssetManifest.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), '{manifest_relpath}'))",
+        ''
+    ]
+    for group, items in groups.items():
+        lines.append(f'class {group}:')
+        for attr, name in items:
+            lines.append(f"    {attr} = '{name}'")
+        lines.append('')
+    open(path, 'w').write('\n'.join(lines))
+
+def main(args: List[str]=None):
+    parser = argparse.ArgumentParser(description='Prebuild texture atlases and an asset manifest from a directory of images.')
+    parser.add_argument('src_dir', help='Directory that contains the loose asset images.')
+    parser.add_argument('dst_dir', help='Output directory for the atlases and manifest.')
+    parser.add_argument('--atlas-size', type=int, default=1024)
+    parser.add_argument('--padding', type=int, default=1)
+    parser.add_argument('--flip', action='append', default=[], help='Glob of asset names to also pack horizontally flipped.')
+    parser.add_argument('--exclude', action='append', default=[], help='Glob of asset names to skip.')
+    parser.add_argument('--module', default=None, help='Also write a generated lookup module to this path.')
+    parsed = parser.parse_args(args)
+
+    manifest = build_atlases(
+        src_dir=parsed.src_dir, dst_dir=parsed.dst_dir,
+        atlas_size=parsed.atlas_size, padding=parsed.padding,
+        flip_patterns=parsed.flip, exclude_patterns=parsed.exclude
+    )
+    manifest_path = os.path.join(parsed.dst_dir, 'manifest.json')
+    write_manifest(manifest, manifest_path)
+    if parsed.module is not None:
+        write_lookup_module(manifest, parsed.module, manifest_path=manifest_path)
+    print(f'Packed {len(manifest)} regions into {len(manifest.atlases)} atlases in {parsed.dst_dir}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+from typing import Dict, List, cast
+import pyglet.gl as gl
+import pyglet.graphics.vertexdomain as vertexdomain
+import pyglet.graphics.vertexbuffer as vertexbuffer
+import pyglet.sprite as sprite_module
+import pyglet.image as image_module
+import pyglet.text.layout as layout_module
+from pyglet.text import Label
+from pyglet.window import Window
+
+from .gl_state import gl_state
+
+COUNTER_NAMES = ['draw_calls', 'vertices', 'indices', 'buffer_uploads', 'upload_bytes', 'texture_binds']
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+class _Section:
+    def __init__(self, stats: DrawStats, name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        # The outermost section wins, so shared primitives (e.g. a Rectangle inside a panel) count for their caller.
+        stack = self.stats._stack
+        stack.append(self.name if len(stack) == 1 else stack[-1])
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats._stack.pop()
+        return False
+
+class DrawStats:
+    def __init__(self, default_subsystem: str='other'):
+        self.enabled = False
+        self._stack = [default_subsystem]
+        self.current = cast(Dict[str, Dict[str, int]], {})
+        self.last_frame = {}
+        self.last_frame_gl_state = {}
+        self.frame_count = 0
+        self._originals = []
+        self._null_section = _NullSection()
+
+    def section(self, name: str):
+        # Counts recorded inside the section are attributed to name, unless an outer section is already open.
+        return _Section(self, name) if self.enabled else self._null_section
+
+    def _count(self, counter_name: str, amount: int=1):
+        subsystem = self._stack[-1]
+        if subsystem not in self.current:
+            self.current[subsystem] = {name: 0 for name in COUNTER_NAMES}
+        self.current[subsystem][counter_name] += amount
+
+    def _wrap_draw(self, func, count_idx: int, counter_name: str):
+        # glDrawArrays counts vertices and glDrawElements counts indices, which repeat shared vertices.
+        def wrapper(*args):
+            self._count('draw_calls')
+            self._count(counter_name, int(args[count_idx]))
+            return func(*args)
+        return wrapper
+
+    def _wrap_multi_draw(self, func, counts_idx: int, counter_name: str):
+        # Fragmented domains draw every allocated region in one glMultiDraw* call.
+        def wrapper(*args):
+            primcount = int(args[-1])
+            self._count('draw_calls', primcount)
+            self._count(counter_name, sum([int(count) for count in args[counts_idx][:primcount]]))
+            return func(*args)
+        return wrapper
+
+    def _wrap_buffer_data(self, func):
+        def wrapper(target, size, data, usage):
+            if data is not None:
+                self._count('buffer_uploads')
+                self._count('upload_bytes', int(size))
+            return func(target, size, data, usage)
+        return wrapper
+
+    def _wrap_buffer_sub_data(self, func):
+        def wrapper(target, offset, size, data):
+            self._count('buffer_uploads')
+            self._count('upload_bytes', int(size))
+            return func(target, offset, size, data)
+        return wrapper
+
+    def _wrap_bind_texture(self, func):
+        def wrapper(*args):
+            self._count('texture_binds')
+            return func(*args)
+        return wrapper
+
+    def _patch(self, module, name: str, wrapper):
+        original = getattr(module, name)
+        self._originals.append((module, name, original))
+        setattr(module, name, wrapper(original))
+
+    def enable(self):
+        if self.enabled:
+            return
+        # pyglet modules bind GL functions with "from pyglet.gl import *", so each call site is patched.
+        for module in [vertexdomain, image_module, gl]:
+            self._patch(
+                module, 'glDrawArrays', lambda func: self._wrap_draw(func, count_idx=2, counter_name='vertices')
+            )
+        for module in [vertexdomain, gl]:
+            self._patch(
+                module, 'glDrawElements', lambda func: self._wrap_draw(func, count_idx=1, counter_name='indices')
+            )
+            self._patch(
+                module, 'glMultiDrawArrays',
+                lambda func: self._wrap_multi_draw(func, counts_idx=2, counter_name='vertices')
+            )
+            self._patch(
+                module, 'glMultiDrawElements',
+                lambda func: self._wrap_multi_draw(func, counts_idx=1, counter_name='indices')
+            )
+        for module in [vertexbuffer, gl]:
+            self._patch(module, 'glBufferData', self._wrap_buffer_data)
+            self._patch(module, 'glBufferSubData', self._wrap_buffer_sub_data)
+        for module in [sprite_module, image_module, layout_module, gl]:
+            self._patch(module, 'glBindTexture', self._wrap_bind_texture)
+        self.enabled = True
+
+    def disable(self):
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+        self.enabled = False
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def next_frame(self):
+        self.last_frame = self.current
+        self.current = {}
+        self.last_frame_gl_state = gl_state.stats
+        gl_state.reset_counters()
+        self.frame_count += 1
+
+    @property
+    def totals(self) -> Dict[str, int]:
+        totals = {name: 0 for name in COUNTER_NAMES}
+        for counters in self.last_frame.values():
+            for name, val in counters.items():
+                totals[name] += val
+        return totals
+
+    def to_lines(self) -> List[str]:
+        totals = self.totals
+        lines = [
+            f"frame {self.frame_count}: draws={totals['draw_calls']} verts={totals['vertices']} "
+            f"idx={totals['indices']} uploads={totals['buffer_uploads']} ({totals['upload_bytes']}B) binds={totals['texture_binds']}"
+        ]
+        for subsystem, counters in sorted(self.last_frame.items()):
+            lines.append(
+                f"  {subsystem}: draws={counters['draw_calls']} verts={counters['vertices']} "
+                f"idx={counters['indices']} uploads={counters['buffer_uploads']} binds={counters['texture_binds']}"
+            )
+        if len(self.last_frame_gl_state) > 0:
+            lines.append(
+                f"gl state: issued={self.last_frame_gl_state['issued']} skipped={self.last_frame_gl_state['skipped']}"
+            )
+        return lines
+
+draw_stats = DrawStats()
+
+class DrawStatsOverlay:
+    def __init__(
+        self, window: Window, stats: DrawStats=draw_stats, font_size: int=10,
+        color: tuple=(255, 255, 0, 255), visible: bool=True
+    ):
+        self.window = window
+        self.stats = stats
+        self.visible = visible
+        self.label = Label(
+            text='', font_name='Courier New', font_size=font_size,
+            x=5, y=window.height - 5, width=window.width - 10,
+            anchor_x='left', anchor_y='top', multiline=True, color=color
+        )
+        self._last_frame_count = None
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def draw(self):
+        if not self.visible or not self.stats.enabled:
+            return
+        if self._last_frame_count != self.stats.frame_count:
+            # The overlay is drawn outside of any section so its own label shows up under the default subsystem.
+            self.label.text = '\n'.join(self.stats.to_lines())
+            self.label.y = self.window.height - 5
+            self._last_frame_count = self.stats.frame_count
+        self.label.draw()
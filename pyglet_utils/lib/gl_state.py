@@ -0,0 +1,103 @@
+from __future__ import annotations
+import pyglet.gl as gl
+
+class GLStateCache:
+    def __init__(self):
+        '''
+        Skips GL calls that wouldn't change anything. pyglet's own groups (labels, sprites) change state without
+        going through the cache, so everything that sets state here has to undo it through the cache when done
+        (disable, disable_alpha_blending, unbind_texture). The cache is then only ever ahead of GL while its own
+        caller is drawing.
+        '''
+        self._enabled = {}
+        self._blend_func = None
+        self._bound_textures = {}
+        self._program = None
+        self._context = None
+        self.num_issued = 0
+        self.num_skipped = 0
+
+    def invalidate(self):
+        # Call this after code that changes GL state behind the cache's back (e.g. pyglet sprite and text groups).
+        self._enabled = {}
+        self._blend_func = None
+        self._bound_textures = {}
+        self._program = None
+
+    def reset_counters(self):
+        self.num_issued = 0
+        self.num_skipped = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'issued': self.num_issued,
+            'skipped': self.num_skipped
+        }
+
+    def _check_context(self):
+        # GL state belongs to a context, so another window (or a recreated one) starts with nothing cached.
+        if gl.current_context is not self._context:
+            self.invalidate()
+            self._context = gl.current_context
+
+    def _skip(self) -> bool:
+        self.num_skipped += 1
+        return False
+
+    def enable(self, cap: int) -> bool:
+        self._check_context()
+        if self._enabled.get(cap, None) is True:
+            return self._skip()
+        gl.glEnable(cap)
+        self._enabled[cap] = True
+        self.num_issued += 1
+        return True
+
+    def disable(self, cap: int) -> bool:
+        self._check_context()
+        if self._enabled.get(cap, None) is False:
+            return self._skip()
+        gl.glDisable(cap)
+        self._enabled[cap] = False
+        self.num_issued += 1
+        return True
+
+    def set_blend_func(self, src: int, dst: int) -> bool:
+        self._check_context()
+        if self._blend_func == (src, dst):
+            return self._skip()
+        gl.glBlendFunc(src, dst)
+        self._blend_func = (src, dst)
+        self.num_issued += 1
+        return True
+
+    def enable_alpha_blending(self):
+        self.enable(gl.GL_BLEND)
+        self.set_blend_func(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+    def disable_alpha_blending(self):
+        self.disable(gl.GL_BLEND)
+
+    def bind_texture(self, target: int, texture_id: int) -> bool:
+        self._check_context()
+        if self._bound_textures.get(target, None) == texture_id:
+            return self._skip()
+        gl.glBindTexture(target, texture_id)
+        self._bound_textures[target] = texture_id
+        self.num_issued += 1
+        return True
+
+    def unbind_texture(self, target: int) -> bool:
+        return self.bind_texture(target, 0)
+
+    def use_program(self, program_id: int) -> bool:
+        self._check_context()
+        if self._program == program_id:
+            return self._skip()
+        gl.glUseProgram(program_id)
+        self._program = program_id
+        self.num_issued += 1
+        return True
+
+gl_state = GLStateCache()
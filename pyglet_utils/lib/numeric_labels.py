@@ -0,0 +1,214 @@
+from __future__ import annotations
+from typing import List, Dict, Tuple, cast
+import pyglet
+import pyglet.gl as gl
+from pyglet.graphics import Batch, Group
+from pyglet.font.base import Glyph
+
+from common_utils.check_utils import check_value
+from .shapes import TextureAtlasGroup
+
+NUMERIC_CHARS = '0123456789-+.,:() '
+
+def _to_rgba(color: Tuple[int]) -> Tuple[int]:
+    return tuple(color) if len(color) == 4 else tuple(list(color) + [255])
+
+class GlyphAtlas:
+    def __init__(
+        self, font_name: str='Times New Roman', font_size: int=12, bold: bool=False,
+        chars: str=NUMERIC_CHARS
+    ):
+        self.font = pyglet.font.load(font_name, font_size, bold=bold)
+        self.chars = chars
+        glyphs = self.font.get_glyphs(chars)
+        self.glyphs = cast(Dict[str, Glyph], {char: glyph for char, glyph in zip(chars, glyphs)})
+        textures = set([glyph.owner.id for glyph in glyphs])
+        if len(textures) != 1:
+            raise Exception(f'Expected all glyphs to share one texture. Got {len(textures)} textures.')
+        self.texture = glyphs[0].owner
+        self.ascent = self.font.ascent
+        self.descent = self.font.descent
+
+    def __contains__(self, char: str) -> bool:
+        return char in self.glyphs
+
+    def get_text_width(self, text: str) -> int:
+        return sum([self.glyphs[char].advance for char in text])
+
+    def layout(self, text: str, x: float=0, y: float=0) -> (List[float], List[float]):
+        # Returns the quad vertices and tex_coords of text with its baseline starting at (x, y).
+        vertices, tex_coords = [], []
+        pen_x = x
+        for char in text:
+            glyph = self.glyphs[char]
+            x0, y0, x1, y1 = glyph.vertices
+            vertices.extend([
+                pen_x + x0, y + y0,
+                pen_x + x1, y + y0,
+                pen_x + x1, y + y1,
+                pen_x + x0, y + y1
+            ])
+            tex_coords.extend(glyph.tex_coords)
+            pen_x += glyph.advance
+        return vertices, tex_coords
+
+class NumericLabel:
+    def __init__(
+        self, label_batch: NumericLabelBatch, text: str, x: float, y: float,
+        anchor_x: str='center', anchor_y: str='center', color: Tuple[int]=(255,255,255,255)
+    ):
+        check_value(anchor_x, valid_value_list=['left', 'center', 'right'])
+        check_value(anchor_y, valid_value_list=['bottom', 'baseline', 'center', 'top'])
+        self.label_batch = label_batch
+        self._text = None
+        self._x = x
+        self._y = y
+        self.anchor_x = anchor_x
+        self.anchor_y = anchor_y
+        self._color = _to_rgba(color)
+        n_vertices = 4 * label_batch.max_chars
+        self.vertex_list = label_batch.batch.add(
+            n_vertices,
+            gl.GL_QUADS,
+            label_batch.group,
+            'v2f/dynamic',
+            't3f/dynamic',
+            ('c4B/static', self._color * n_vertices)
+        )
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, text: str):
+        if text != self._text:
+            self.label_batch._check_text(text)
+            self._text = text
+            self._update(tex_coords_changed=True)
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @x.setter
+    def x(self, x: float):
+        if x != self._x:
+            self._x = x
+            self._update()
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @y.setter
+    def y(self, y: float):
+        if y != self._y:
+            self._y = y
+            self._update()
+
+    @property
+    def color(self) -> Tuple[int]:
+        return self._color
+
+    @color.setter
+    def color(self, color: Tuple[int]):
+        color = _to_rgba(color)
+        if color != self._color:
+            self._color = color
+            self.vertex_list.colors[:] = color * (4 * self.label_batch.max_chars)
+
+    def update(self, x: float=None, y: float=None, text: str=None):
+        # Position and text are applied together so that a wrapped label is rewritten once.
+        tex_coords_changed = False
+        if text is not None and text != self._text:
+            self.label_batch._check_text(text)
+            self._text = text
+            tex_coords_changed = True
+        self._x = x if x is not None else self._x
+        self._y = y if y is not None else self._y
+        self._update(tex_coords_changed=tex_coords_changed)
+
+    def move(self, dx: float=0, dy: float=0):
+        self.update(x=self._x+dx, y=self._y+dy)
+
+    def _get_origin(self) -> (float, float):
+        atlas = self.label_batch.atlas
+        if self.anchor_x == 'left':
+            x = self._x
+        elif self.anchor_x == 'center':
+            x = self._x - atlas.get_text_width(self._text) // 2
+        else:
+            x = self._x - atlas.get_text_width(self._text)
+        if self.anchor_y == 'baseline':
+            y = self._y
+        elif self.anchor_y == 'bottom':
+            y = self._y - atlas.descent
+        elif self.anchor_y == 'center':
+            y = self._y - (atlas.ascent + atlas.descent) // 2
+        else:
+            y = self._y - atlas.ascent
+        return x, y
+
+    def _update(self, tex_coords_changed: bool=False):
+        x, y = self._get_origin()
+        vertices, tex_coords = self.label_batch.atlas.layout(self._text, x=x, y=y)
+        n_unused = self.label_batch.max_chars - len(self._text)
+        # Unused character slots are collapsed to degenerate quads.
+        self.vertex_list.vertices[:] = vertices + [0.0] * (8 * n_unused)
+        if tex_coords_changed:
+            self.vertex_list.tex_coords[:] = tex_coords + [0.0] * (12 * n_unused)
+
+    def delete(self):
+        self.label_batch.remove(self)
+
+class NumericLabelBatch:
+    def __init__(
+        self, atlas: GlyphAtlas, max_chars: int=12, color: Tuple[int]=(255,255,255,255),
+        batch: Batch=None, parent_group: Group=None
+    ):
+        self.atlas = atlas
+        self.max_chars = max_chars
+        self.color = _to_rgba(color)
+        self.batch = batch if batch is not None else Batch()
+        self.group = TextureAtlasGroup(atlas=atlas, parent=parent_group)
+        self.labels = cast(List[NumericLabel], [])
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def _check_text(self, text: str):
+        if len(text) > self.max_chars:
+            raise ValueError(f"'{text}' is longer than max_chars={self.max_chars}")
+        for char in text:
+            if char not in self.atlas:
+                raise ValueError(f"'{char}' is not in the glyph atlas. Available characters: '{self.atlas.chars}'")
+
+    def add(
+        self, text: str, x: float, y: float, anchor_x: str='center', anchor_y: str='center',
+        color: Tuple[int]=None
+    ) -> NumericLabel:
+        label = NumericLabel(
+            label_batch=self, text=text, x=x, y=y,
+            anchor_x=anchor_x, anchor_y=anchor_y,
+            color=color if color is not None else self.color
+        )
+        self.labels.append(label)
+        return label
+
+    def remove(self, label: NumericLabel):
+        if label in self.labels:
+            self.labels.remove(label)
+            label.vertex_list.delete()
+
+    def clear(self):
+        for label in self.labels:
+            label.vertex_list.delete()
+        self.labels = []
+
+    def draw(self):
+        self.batch.draw()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, List, Tuple
 from ..lib.shapes import Rectangle
+from ..lib.draw_stats import draw_stats
 
 class PanelObject:
     def __init__(self, obj: Any, parent, scale_with_parent: bool=False):
@@ -241,9 +242,10 @@ class Panel:
         return self.width / self.height
 
     def draw(self):
-        self.bg_rect.draw()
-        for panel_obj in self.contained_objects:
-            panel_obj.draw()
+        with draw_stats.section('panel'):
+            self.bg_rect.draw()
+            for panel_obj in self.contained_objects:
+                panel_obj.draw()
 
     def add_obj(self, obj: Any, relative: bool=False, scale_with_parent: bool=False):
         if not relative:
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from typing import List, Tuple
+import numpy as np
+import pyglet.gl as gl
+from pyglet.graphics import vertex_list, vertex_list_indexed
+from pyglet.graphics.vertexdomain import VertexList
+
+from common_utils.check_utils import check_value
+from .shapes import GL_Color, GL_Point2D, GL_Points2D_Base, GL_Points2D, GL_Triangles2D, GL_TriangleStrip2D, GL_Quads2D
+
+class GL_PointArray2D_Base:
+    mode = gl.GL_POINTS
+    point_cls = GL_Points2D
+
+    def __init__(self, coords: np.ndarray, colors: np.ndarray=None, usage: str='dynamic'):
+        coords = np.ascontiguousarray(coords, dtype=np.float32)
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError(f'coords must have shape (N, 2). Got {coords.shape}')
+        if colors is None:
+            colors = np.tile(np.array([255, 0, 0], dtype=np.uint8), (coords.shape[0], 1))
+        colors = np.ascontiguousarray(colors, dtype=np.uint8)
+        if colors.ndim != 2 or colors.shape[0] != coords.shape[0] or colors.shape[1] not in [3, 4]:
+            raise ValueError(f'colors must have shape (N, 3) or (N, 4) with N == {coords.shape[0]}. Got {colors.shape}')
+        check_value(usage, valid_value_list=['static', 'dynamic', 'stream'])
+        self._coords = coords
+        self._colors = colors
+        self.usage = usage
+
+        # Persistent Vertex List Related
+        self._vertex_list = None
+        self._idx_order = None
+        self._coords_dirty = True
+        self._colors_dirty = True
+
+    def __len__(self) -> int:
+        return self._coords.shape[0]
+
+    @property
+    def coords(self) -> np.ndarray:
+        return self._coords
+
+    @coords.setter
+    def coords(self, coords: np.ndarray):
+        coords = np.ascontiguousarray(coords, dtype=np.float32)
+        if coords.shape != self._coords.shape:
+            # A different number of points needs a new vertex list.
+            self.delete()
+            if coords.shape[0] != self._colors.shape[0]:
+                self._colors = np.resize(self._colors, (coords.shape[0], self._colors.shape[1]))
+        self._coords = coords
+        self._coords_dirty = True
+
+    @property
+    def colors(self) -> np.ndarray:
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors: np.ndarray):
+        colors = np.ascontiguousarray(colors, dtype=np.uint8)
+        if colors.shape != self._colors.shape:
+            if colors.shape[0] != self._coords.shape[0]:
+                raise ValueError(f'Expected {self._coords.shape[0]} colors. Got {colors.shape[0]}')
+            self.delete()
+        self._colors = colors
+        self._colors_dirty = True
+
+    @property
+    def color_format(self) -> str:
+        return f'c{self._colors.shape[1]}B'
+
+    @classmethod
+    def from_list(cls, coord_list: List[list], color_list: List[list]=None, usage: str='dynamic') -> GL_PointArray2D_Base:
+        return cls(
+            coords=np.array(coord_list, dtype=np.float32).reshape(-1, 2),
+            colors=np.array(color_list, dtype=np.uint8) if color_list is not None else None,
+            usage=usage
+        )
+
+    @classmethod
+    def from_points(cls, points: GL_Points2D_Base, usage: str='dynamic') -> GL_PointArray2D_Base:
+        return cls(
+            coords=np.array([[point.x, point.y] for point in points], dtype=np.float32).reshape(-1, 2),
+            colors=np.array([point.color.to_list() for point in points], dtype=np.uint8).reshape(-1, 3),
+            usage=usage
+        )
+
+    def to_points(self) -> GL_Points2D_Base:
+        return self.point_cls(
+            [
+                GL_Point2D(x=float(x), y=float(y), color=GL_Color.from_list([int(val) for val in color[:3]]))
+                for (x, y), color in zip(self._coords.tolist(), self._colors.tolist())
+            ]
+        )
+
+    def copy(self) -> GL_PointArray2D_Base:
+        return type(self)(coords=self._coords.copy(), colors=self._colors.copy(), usage=self.usage)
+
+    @property
+    def centroid(self) -> (float, float):
+        cx, cy = self._coords.mean(axis=0) if len(self) > 0 else (0.0, 0.0)
+        return (float(cx), float(cy))
+
+    def move(self, dx: float=0.0, dy: float=0.0):
+        self._coords += np.array([dx, dy], dtype=np.float32)
+        self._coords_dirty = True
+
+    def scale(self, scale_x: float=1.0, scale_y: float=1.0, origin: Tuple[float]=None):
+        ox, oy = origin if origin is not None else self.centroid
+        offset = np.array([ox, oy], dtype=np.float32)
+        self._coords -= offset
+        self._coords *= np.array([scale_x, scale_y], dtype=np.float32)
+        self._coords += offset
+        self._coords_dirty = True
+
+    def rotate(self, angle: float, origin: Tuple[float]=None):
+        '''Rotates counter-clockwise by angle degrees around origin (the centroid by default).'''
+        ox, oy = origin if origin is not None else self.centroid
+        offset = np.array([ox, oy], dtype=np.float32)
+        theta = np.radians(angle)
+        rotation = np.array(
+            [
+                [np.cos(theta), np.sin(theta)],
+                [-np.sin(theta), np.cos(theta)]
+            ], dtype=np.float32
+        )
+        self._coords[:] = (self._coords - offset) @ rotation + offset
+        self._coords_dirty = True
+
+    def recolor(self, color: Tuple[int], idx: np.ndarray=None):
+        color = np.asarray(color, dtype=np.uint8)
+        if color.ndim == 1 and color.shape[0] != self._colors.shape[1]:
+            raise ValueError(f'Expected a color with {self._colors.shape[1]} channels. Got {color.shape[0]}')
+        if idx is None:
+            self._colors[:] = color
+        else:
+            self._colors[idx] = color
+        self._colors_dirty = True
+
+    def delete(self):
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+            self._vertex_list = None
+        self._coords_dirty = True
+        self._colors_dirty = True
+
+    def _build_vertex_list(self, idx_order: List[int]=None):
+        self.delete()
+        if idx_order is None:
+            self._vertex_list = vertex_list(
+                len(self), f'v2f/{self.usage}', f'{self.color_format}/{self.usage}'
+            )
+        else:
+            self._vertex_list = vertex_list_indexed(
+                len(self), tuple(idx_order), f'v2f/{self.usage}', f'{self.color_format}/{self.usage}'
+            )
+        self._idx_order = tuple(idx_order) if idx_order is not None else None
+
+    def _sync_vertex_list(self, idx_order: List[int]=None):
+        idx_order = tuple(idx_order) if idx_order is not None else None
+        if self._vertex_list is None or self._vertex_list.get_size() != len(self) \
+            or (idx_order is None) != (self._idx_order is None) \
+            or (idx_order is not None and len(idx_order) != len(self._idx_order)):
+            self._build_vertex_list(idx_order=idx_order)
+        elif idx_order != self._idx_order:
+            self._vertex_list.indices = [idx + self._vertex_list.start for idx in idx_order]
+            self._idx_order = idx_order
+        # The attribute regions are viewed as numpy arrays so the upload is a single memcpy.
+        if self._coords_dirty:
+            np.frombuffer(self._vertex_list.vertices, dtype=np.float32)[:] = self._coords.ravel()
+            self._coords_dirty = False
+        if self._colors_dirty:
+            np.frombuffer(self._vertex_list.colors, dtype=np.uint8)[:] = self._colors.ravel()
+            self._colors_dirty = False
+
+    @property
+    def vertex_list(self) -> VertexList:
+        self._sync_vertex_list(idx_order=None)
+        return self._vertex_list
+
+    def draw(self, idx_order: List[int]=None, mode: int=None):
+        self._sync_vertex_list(idx_order=idx_order)
+        self._vertex_list.draw(mode if mode is not None else self.mode)
+
+class GL_PointArray2D(GL_PointArray2D_Base):
+    mode = gl.GL_POINTS
+    point_cls = GL_Points2D
+
+class GL_TriangleArray2D(GL_PointArray2D_Base):
+    mode = gl.GL_TRIANGLES
+    point_cls = GL_Triangles2D
+
+class GL_TriangleStripArray2D(GL_PointArray2D_Base):
+    mode = gl.GL_TRIANGLE_STRIP
+    point_cls = GL_TriangleStrip2D
+
+class GL_QuadArray2D(GL_PointArray2D_Base):
+    mode = gl.GL_QUADS
+    point_cls = GL_Quads2D
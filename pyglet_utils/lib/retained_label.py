@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Any, Callable
+import time
+from pyglet.text import Label
+
+class RetainedLabel:
+    def __init__(
+        self, label: Label=None, formatter: Callable[[Any], str]=str,
+        max_updates_per_second: float=None, **label_kwargs
+    ):
+        self.label = label if label is not None else Label(**label_kwargs)
+        self.formatter = formatter
+        self.max_updates_per_second = max_updates_per_second
+        self._value = None
+        self._key = None
+        self._has_value = False
+        self._pending = None
+        self._has_pending = False
+        self._last_update_time = None
+
+        # Stats
+        self.num_requests = 0
+        self.num_throttled = 0
+        self.num_layouts = 0
+
+    @property
+    def text(self) -> str:
+        return self.label.text
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @property
+    def min_update_interval(self) -> float:
+        if self.max_updates_per_second is None or self.max_updates_per_second <= 0:
+            return 0.0
+        return 1.0 / self.max_updates_per_second
+
+    def _is_throttled(self, now: float) -> bool:
+        return self._last_update_time is not None and now - self._last_update_time < self.min_update_interval
+
+    def _apply(self, value: Any, now: float):
+        self._last_update_time = now
+        if self._has_value and value == self._value:
+            return
+        self._value = value
+        self._has_value = True
+        text = self.formatter(value)
+        if text != self.label.text:
+            # Assigning Label.text always re-lays-out the document, so it is only done when the string differs.
+            self.label.text = text
+            self.num_layouts += 1
+
+    def set_value(self, value: Any, force: bool=False) -> bool:
+        '''Returns True if the value was applied now, False if it was deferred by throttling.'''
+        self.num_requests += 1
+        now = time.perf_counter()
+        if not force and self._is_throttled(now):
+            self._pending = value
+            self._has_pending = True
+            self.num_throttled += 1
+            return False
+        self._pending, self._has_pending = None, False
+        self._apply(value, now)
+        return True
+
+    def update(self, source: Callable[[], Any], key: Any=None, force: bool=False) -> bool:
+        # source is only called when an update is allowed, and key (if given) skips it entirely while unchanged.
+        if key is not None and self._has_value and key == self._key and not self._has_pending:
+            return False
+        self.num_requests += 1
+        now = time.perf_counter()
+        if not force and self._is_throttled(now):
+            self.num_throttled += 1
+            return False
+        self._key = key
+        self._pending, self._has_pending = None, False
+        self._apply(source(), now)
+        return True
+
+    def flush(self):
+        if self._has_pending:
+            value = self._pending
+            self._pending, self._has_pending = None, False
+            self._apply(value, time.perf_counter())
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'requests': self.num_requests,
+            'throttled': self.num_throttled,
+            'layouts': self.num_layouts
+        }
+
+    def draw(self):
+        if self._has_pending and not self._is_throttled(time.perf_counter()):
+            self.flush()
+        self.label.draw()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 from typing import List, Tuple, Dict, Any
+import numpy as np
 from pyglet.graphics import draw, draw_indexed, vertex_list, vertex_list_indexed
 import pyglet.gl as gl
 from pyglet.graphics.vertexdomain import VertexList, IndexedVertexList
-from pyglet.graphics import Batch
+from pyglet.graphics import Batch, Group
 
 from logger import logger
+from .gl_state import gl_state
+from .draw_stats import draw_stats
 from common_utils.common_types.point import Point2D, Point2D_List
 from common_utils.base.basic import BasicObject, BasicHandler
 from common_utils.check_utils import check_list_length, check_value_from_list, \
@@ -13,6 +16,7 @@ from common_utils.check_utils import check_list_length, check_value_from_list, \
 
 from typing import TypeVar
 from abc import abstractmethod, ABCMeta
+from math import floor
 
 T = TypeVar('T')
 H = TypeVar('H')
@@ -24,6 +28,14 @@ def find_duplicates(val_list: list) -> Dict[Any, int]:
             duplicate_dict[val] = val_list.count(val)
     return duplicate_dict
 
+def write_vertex_region(vertex_list: VertexList, attr_name: str, start: int, count: int, values: list):
+    # Only the [start, start + count) slice of the attribute buffer is invalidated, so the next draw
+    # uploads just the changed range.
+    attribute = vertex_list.domain.attribute_names[attr_name]
+    region = attribute.get_region(attribute.buffer, vertex_list.start + start, count)
+    region.array[:] = values
+    region.invalidate()
+
 class GL_Color(BasicObject):
     def __init__(self, r: int, b: int, g: int):
         super().__init__()
@@ -61,6 +73,18 @@ class GL_Point2D(BasicObject['GL_Point2D']):
         self.__x = x
         self.__y = y
         self.__color = color
+        self._observers = []
+
+    def add_observer(self, callback):
+        self._observers.append(callback)
+
+    def remove_observer(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def _notify(self):
+        for callback in self._observers:
+            callback(self)
 
     @property
     def vertex_list(self) -> VertexList:
@@ -81,6 +105,7 @@ class GL_Point2D(BasicObject['GL_Point2D']):
     def x(self, x: float):
         check_type(x, valid_type_list=[float, int])
         self.__x = x
+        self._notify()
     
     @property
     def y(self) -> float:
@@ -90,6 +115,7 @@ class GL_Point2D(BasicObject['GL_Point2D']):
     def y(self, y: float):
         check_type(y, valid_type_list=[float, int])
         self.__y = y
+        self._notify()
     
     def move(self, dx: float, dy: float):
         self.x += dx
@@ -109,11 +135,90 @@ class GL_Point2D(BasicObject['GL_Point2D']):
             self.__color = GL_Color.from_tuple(color)
         else:
             raise Exception
+        self._notify()
 
 class GL_Points2D_Base(BasicHandler[H, 'GL_Point2D']):
-    def __init__(self, point_list: List[GL_Point2D]=None):
+    def __init__(self, point_list: List[GL_Point2D]=None, usage: str='dynamic'):
         super().__init__(obj_type=GL_Point2D, obj_list=point_list)
         self.point_list = point_list
+        check_value(usage, valid_value_list=['static', 'dynamic', 'stream'])
+        self.usage = usage
+
+        # Persistent Vertex List Related
+        self._vertex_list = None
+        self._idx_order = None
+        self._observed_points = {}
+        self._dirty_start, self._dirty_end = None, None
+
+    def _on_point_changed(self, point: GL_Point2D):
+        idx = self._observed_points.get(id(point), None)
+        if idx is not None:
+            self.mark_dirty(start=idx, end=idx+1)
+
+    def mark_dirty(self, start: int=0, end: int=None):
+        end = end if end is not None else len(self)
+        self._dirty_start = start if self._dirty_start is None else min(self._dirty_start, start)
+        self._dirty_end = end if self._dirty_end is None else max(self._dirty_end, end)
+
+    def invalidate(self):
+        self.delete()
+
+    def delete(self):
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+            self._vertex_list = None
+        for point in self:
+            point.remove_observer(self._on_point_changed)
+        self._observed_points = {}
+        self._dirty_start, self._dirty_end = None, None
+
+    def _get_flat_data(self, start: int, end: int) -> (List[float], List[int]):
+        flat_coords = []
+        flat_colors = []
+        for point in self.obj_list[start:end]:
+            flat_coords.extend([point.x, point.y])
+            flat_colors.extend(point.color.to_list())
+        return flat_coords, flat_colors
+
+    def _build_vertex_list(self, idx_order: List[int]=None):
+        self.delete()
+        flat_coords, flat_colors = self._get_flat_data(start=0, end=len(self))
+        if idx_order is None:
+            self._vertex_list = vertex_list(
+                len(self),
+                (f'v2f/{self.usage}', tuple(flat_coords)),
+                (f'c3B/{self.usage}', tuple(flat_colors))
+            )
+        else:
+            self._vertex_list = vertex_list_indexed(
+                len(self),
+                tuple(idx_order),
+                (f'v2f/{self.usage}', tuple(flat_coords)),
+                (f'c3B/{self.usage}', tuple(flat_colors))
+            )
+        self._idx_order = tuple(idx_order) if idx_order is not None else None
+        for i, point in enumerate(self):
+            point.add_observer(self._on_point_changed)
+            self._observed_points[id(point)] = i
+
+    def _write_range(self, start: int, end: int):
+        flat_coords, flat_colors = self._get_flat_data(start=start, end=end)
+        write_vertex_region(self._vertex_list, 'vertices', start=start, count=end - start, values=flat_coords)
+        write_vertex_region(self._vertex_list, 'colors', start=start, count=end - start, values=flat_colors)
+
+    def _sync_vertex_list(self, idx_order: List[int]=None):
+        idx_order = tuple(idx_order) if idx_order is not None else None
+        if self._vertex_list is None or self._vertex_list.get_size() != len(self) \
+            or (idx_order is None) != (self._idx_order is None) \
+            or (idx_order is not None and len(idx_order) != len(self._idx_order)):
+            self._build_vertex_list(idx_order=idx_order)
+            return
+        if idx_order != self._idx_order:
+            self._vertex_list.indices = [idx + self._vertex_list.start for idx in idx_order]
+            self._idx_order = idx_order
+        if self._dirty_start is not None:
+            self._write_range(start=self._dirty_start, end=self._dirty_end)
+            self._dirty_start, self._dirty_end = None, None
 
     def move(self, dx: float=0.0, dy: float=0.0):
         for point in self:
@@ -138,29 +243,12 @@ class GL_Points2D_Base(BasicHandler[H, 'GL_Point2D']):
 
     @property
     def vertex_list(self) -> VertexList:
-        flat_coords = []
-        flat_colors = []
-        for point in self:
-            flat_coords.extend([point.x, point.y])
-            flat_colors.extend(point.color.to_list())
-        return vertex_list(
-            len(self),
-            ('v2f', tuple(flat_coords)),
-            ('c3B', tuple(flat_colors))
-        )
+        self._sync_vertex_list(idx_order=None)
+        return self._vertex_list
 
     def get_indexed_vertex_list(self, idx_order: List[int]) -> IndexedVertexList:
-        flat_coords = []
-        flat_colors = []
-        for point in self:
-            flat_coords.extend([point.x, point.y])
-            flat_colors.extend(point.color.to_list())
-        return vertex_list_indexed(
-            len(self),
-            tuple(idx_order),
-            ('v2f', tuple(flat_coords)),
-            ('c3B', tuple(flat_colors))
-        )
+        self._sync_vertex_list(idx_order=idx_order)
+        return self._vertex_list
 
     def draw(self, idx_order: List[int]=None, mode: int=gl.GL_POINTS):
         if idx_order is None:
@@ -245,9 +333,6 @@ class Rectangle:
         self, x: int, y: int, width: int, height: int, color: Tuple[int]=(255,0,0),
         transparency: int=255, usage: str='dynamic'
     ):
-        gl.glEnable(gl.GL_BLEND)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-
         self.x = x
         self.y = y
         self.width = width
@@ -312,7 +397,163 @@ class Rectangle:
         self.update_colors()
 
     def draw(self):
-        self.vertex_list.draw(gl.GL_TRIANGLES)
+        with draw_stats.section('rectangle'):
+            gl_state.enable_alpha_blending()
+            self.vertex_list.draw(gl.GL_TRIANGLES)
+            gl_state.disable_alpha_blending()
+
+class BlendGroup(Group):
+    def set_state(self):
+        gl_state.enable_alpha_blending()
+
+    def unset_state(self):
+        gl_state.disable_alpha_blending()
+
+class TextureAtlasGroup(Group):
+    def __init__(self, atlas, parent: Group=None):
+        '''Binds atlas.texture, so everything drawn from one atlas shares a single state change.'''
+        super().__init__(parent=parent)
+        self.atlas = atlas
+
+    def set_state(self):
+        texture = self.atlas.texture
+        gl_state.enable(texture.target)
+        gl_state.bind_texture(texture.target, texture.id)
+        gl_state.enable_alpha_blending()
+
+    def unset_state(self):
+        texture = self.atlas.texture
+        gl_state.disable_alpha_blending()
+        gl_state.unbind_texture(texture.target)
+        gl_state.disable(texture.target)
+
+class RectangleHandle:
+    def __init__(
+        self, rect_batch: RectangleBatch, x: int, y: int, width: int, height: int,
+        color: Tuple[int]=(255,0,0), transparency: int=255
+    ):
+        self.rect_batch = rect_batch
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self.transparency = transparency
+        self._visible = True
+        self.vertex_list = rect_batch.batch.add_indexed(
+            4,
+            gl.GL_TRIANGLES,
+            rect_batch.group,
+            [0, 1, 2, 1, 2, 3],
+            (f'v2f/{rect_batch.usage}', self._get_vertices()),
+            (f'c4B/{rect_batch.usage}', self._get_colors())
+        )
+
+    def _get_vertices(self) -> Tuple[float]:
+        if not self._visible:
+            return (0, 0)*4
+        return (
+            self.x, self.y,
+            self.x, self.y + self.height,
+            self.x + self.width, self.y,
+            self.x + self.width, self.y + self.height
+        )
+
+    def _get_colors(self) -> Tuple[int]:
+        return tuple((list(self.color) + [self.transparency])*4)
+
+    def update_vertices(self):
+        self.vertex_list.vertices[:] = self._get_vertices()
+
+    def update_colors(self):
+        self.vertex_list.colors[:] = self._get_colors()
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool):
+        if visible != self._visible:
+            # Hidden rectangles are collapsed to a degenerate quad so that they stay in the shared buffer.
+            self._visible = visible
+            self.update_vertices()
+
+    def move(self, dx: int=0, dy: int=0):
+        self.x += dx
+        self.y += dy
+        self.update_vertices()
+
+    def move_to(self, x: int=None, y: int=None):
+        if x is not None:
+            self.x = x
+        if y is not None:
+            self.y = y
+        self.update_vertices()
+
+    def resize(self, width: int=None, height: int=None):
+        if width is not None:
+            self.width = width
+        if height is not None:
+            self.height = height
+        self.update_vertices()
+
+    def scale(self, scale_x: float=1.0, scale_y: float=1.0):
+        self.width = int(self.width*scale_x)
+        self.height = int(self.height*scale_y)
+        self.update_vertices()
+
+    def grow(self, dw: int=0, dh: int=0):
+        self.width += dw
+        self.height += dh
+        self.update_vertices()
+
+    def change_color(self, color: Tuple[int], transparency: int=None):
+        self.color = color
+        if transparency is not None:
+            self.transparency = transparency
+        self.update_colors()
+
+    def delete(self):
+        self.rect_batch.remove(self)
+
+class RectangleBatch:
+    def __init__(self, usage: str='dynamic', batch: Batch=None, parent_group: Group=None):
+        check_value(usage, valid_value_list=['static', 'dynamic', 'stream'])
+        self.usage = usage
+        self.batch = batch if batch is not None else Batch()
+        self.group = BlendGroup(parent=parent_group)
+        self.rectangles = []
+
+    def __len__(self) -> int:
+        return len(self.rectangles)
+
+    def __iter__(self):
+        return iter(self.rectangles)
+
+    def add(
+        self, x: int, y: int, width: int, height: int,
+        color: Tuple[int]=(255,0,0), transparency: int=255
+    ) -> RectangleHandle:
+        rect = RectangleHandle(
+            rect_batch=self, x=x, y=y, width=width, height=height,
+            color=color, transparency=transparency
+        )
+        self.rectangles.append(rect)
+        return rect
+
+    def remove(self, rect: RectangleHandle):
+        if rect in self.rectangles:
+            self.rectangles.remove(rect)
+            rect.vertex_list.delete()
+
+    def clear(self):
+        for rect in self.rectangles:
+            rect.vertex_list.delete()
+        self.rectangles = []
+
+    def draw(self):
+        self.batch.draw()
 
 class GLGrid(metaclass=ABCMeta):
     def __init__(
@@ -327,7 +568,6 @@ class GLGrid(metaclass=ABCMeta):
         self._tile_width, self._tile_height = tile_width, tile_height
         self._grid_origin_x, self._grid_origin_y = grid_origin_x, grid_origin_y
         self.batch = Batch()
-        self._vertex_list_grid = []
 
     @property
     def grid_width(self) -> int:
@@ -365,6 +605,14 @@ class GLGrid(metaclass=ABCMeta):
     def grid_origin(self) -> (int, int):
         return (self.grid_origin_x, self.grid_origin_y)
 
+    @property
+    def n_rows(self) -> int:
+        return self.grid_height // self.tile_height
+
+    @property
+    def n_cols(self) -> int:
+        return self.grid_width // self.tile_width
+
     @abstractmethod
     def _init_batch(self, usage: str):
         raise NotImplementedError
@@ -373,106 +621,168 @@ class GLGrid(metaclass=ABCMeta):
         self.batch.draw()
 
 class RectangleGrid(GLGrid):
-    def __init__(self, grid_width: int, grid_height: int, tile_width: int, tile_height: int, usage: str='dynamic', color_seq: List[Tuple[int]]=[(255,0,0), (0,255,0), (0,0,255)]):
+    def __init__(
+        self, grid_width: int, grid_height: int, tile_width: int, tile_height: int, usage: str='dynamic',
+        color_seq: List[Tuple[int]]=[(255,0,0), (0,255,0), (0,0,255)], transparency: int=None
+    ):
         super().__init__(
             grid_width=grid_width, grid_height=grid_height,
             tile_width=tile_width, tile_height=tile_height
         )
-        self._init_batch(usage=usage, color_seq=color_seq)
-    
-    def _init_batch(self, usage: str, color_seq: List[Tuple[int]]):
+        self._vertex_list = None
+        self._init_batch(usage=usage, color_seq=color_seq, transparency=transparency)
+
+    @property
+    def n_channels(self) -> int:
+        return 3 if self._transparency is None else 4
+
+    def _init_batch(self, usage: str, color_seq: List[Tuple[int]], transparency: int=None):
         check_value(usage, valid_value_list=['static', 'dynamic', 'stream'])
-        n_rows = self.grid_height // self.tile_height
-        n_cols = self.grid_width // self.tile_width
-        for row in range(n_rows):
-            vertex_list_row = []
-            for col in range(n_cols):
-                x = col * self.tile_width
-                y = row * self.tile_height
-                color = color_seq[(row * n_cols + col) % len(color_seq)]
-                vertex_list = self.batch.add_indexed(
-                    4,
-                    gl.GL_TRIANGLES,
-                    None,
-                    [0, 1, 2, 1, 2, 3],
-                    (
-                        f'v2f/{usage}',
-                        (
-                            x, y,
-                            x, y + self.tile_height,
-                            x + self.tile_width, y,
-                            x + self.tile_width, y + self.tile_height
-                        )
-                    ),
-                    (f'c3B/{usage}', tuple(list(color)*4))
-                )
-                vertex_list_row.append(vertex_list)
-            self._vertex_list_grid.append(vertex_list_row)
+        self._transparency = transparency
+        n_rows, n_cols = self.n_rows, self.n_cols
+        n_tiles = n_rows * n_cols
+
+        # All tiles live in one vertex list, ordered row-major with 4 vertices per tile.
+        rows, cols = np.meshgrid(np.arange(n_rows), np.arange(n_cols), indexing='ij')
+        x0 = (cols * self.tile_width).astype(np.float32)
+        y0 = (rows * self.tile_height).astype(np.float32)
+        x1, y1 = x0 + self.tile_width, y0 + self.tile_height
+        vertices = np.stack([x0, y0, x0, y1, x1, y0, x1, y1], axis=-1)
+        indices = (np.arange(n_tiles).reshape(-1, 1) * 4 + np.array([0, 1, 2, 1, 2, 3])).ravel()
+
+        colors = np.array(color_seq, dtype=np.uint8)[np.arange(n_tiles) % len(color_seq)]
+        if self.n_channels == 4:
+            alpha = np.full((n_tiles, 1), transparency, dtype=np.uint8)
+            colors = np.concatenate([colors[:, :3], alpha], axis=1)
+        self._vertex_list = self.batch.add_indexed(
+            4 * n_tiles,
+            gl.GL_TRIANGLES,
+            BlendGroup() if self.n_channels == 4 else None,
+            indices.tolist(),
+            (f'v2f/{usage}', vertices.ravel().tolist()),
+            (f'c{self.n_channels}B/{usage}', np.repeat(colors, 4, axis=0).ravel().tolist())
+        )
+
+    @property
+    def vertex_list(self) -> IndexedVertexList:
+        return self._vertex_list
+
+    def _get_color_view(self) -> np.ndarray:
+        # Writing through this view invalidates the whole color region once, so a full-grid update is a single upload.
+        return np.frombuffer(self._vertex_list.colors, dtype=np.uint8).reshape(self.n_rows, self.n_cols, 4, self.n_channels)
+
+    def get_tile_colors(self) -> np.ndarray:
+        return self._get_color_view()[:, :, 0, :].copy()
+
+    def set_tile_colors(self, colors: np.ndarray):
+        colors = np.asarray(colors, dtype=np.uint8)
+        if colors.shape[:2] != (self.n_rows, self.n_cols) or colors.shape[2] not in [3, 4]:
+            raise ValueError(f'Expected colors of shape ({self.n_rows}, {self.n_cols}, 3 or 4). Got {colors.shape}')
+        n_channels = min(colors.shape[2], self.n_channels)
+        self._get_color_view()[:, :, :, :n_channels] = colors[:, :, None, :n_channels]
+
+    def set_tile_color(self, row: int, col: int, color: Tuple[int]):
+        color = np.asarray(color, dtype=np.uint8)
+        n_channels = min(color.shape[0], self.n_channels)
+        self._get_color_view()[row, col, :, :n_channels] = color[:n_channels]
+
+class TranslateGroup(Group):
+    def __init__(self, x: float=0, y: float=0, parent: Group=None):
+        super().__init__(parent=parent)
+        self.x = x
+        self.y = y
 
-    def vertex_list(self, row: int, col: int):
-        return self._vertex_list_grid[row][col]
+    def set_state(self):
+        gl.glPushMatrix()
+        gl.glTranslatef(self.x, self.y, 0)
+
+    def unset_state(self):
+        gl.glPopMatrix()
 
 class LineGrid(GLGrid):
     def __init__(
         self, grid_width: int, grid_height: int, tile_width: int, tile_height: int,
         grid_origin_x: int=0, grid_origin_y: int=0,
-        usage: str='dynamic', color: Tuple[int]=(0,0,255)
+        usage: str='dynamic', color: Tuple[int]=(0,0,255), world_bounds: Tuple[int]=None
     ):
         super().__init__(
             grid_width=grid_width, grid_height=grid_height,
             tile_width=tile_width, tile_height=tile_height,
             grid_origin_x=grid_origin_x, grid_origin_y=grid_origin_y
         )
+        # world_bounds: (xmin, ymin, xmax, ymax) in world coordinates. None means the grid is unbounded.
+        self.world_bounds = world_bounds
+        self.group = TranslateGroup()
+        self._vertex_list = None
+        self._camera_x, self._camera_y = 0, 0
+        self._tile_x, self._tile_y = None, None
         self._init_batch(usage=usage, color=color)
-    
+
+    @property
+    def n_horizontal_lines(self) -> int:
+        return self.n_rows + 2
+
+    @property
+    def n_vertical_lines(self) -> int:
+        return self.n_cols + 2
+
     def _init_batch(self, usage: str, color: Tuple[int]):
         check_value(usage, valid_value_list=['static', 'dynamic', 'stream'])
-        n_rows = self.grid_height // self.tile_height
-        n_cols = self.grid_width // self.tile_width
-        horizontal_vertex_lists = []
-        for row in range(n_rows+1):
+        # One extra line in each direction so that the grid still covers the window after a sub-tile shift.
+        count = 2 * (self.n_horizontal_lines + self.n_vertical_lines)
+        self._vertex_list = self.batch.add(
+            count,
+            gl.GL_LINES,
+            self.group,
+            f'v2f/{usage}',
+            (f'c3B/{usage}', tuple(list(color)*count))
+        )
+        self.set_camera(x=self._camera_x, y=self._camera_y)
+
+    @property
+    def vertex_list(self) -> VertexList:
+        return self._vertex_list
+
+    @property
+    def camera(self) -> (float, float):
+        return (self._camera_x, self._camera_y)
+
+    def scroll(self, dx: float=0, dy: float=0):
+        # Moves the lines by (dx, dy) on screen, i.e. the camera by (-dx, -dy).
+        self.set_camera(x=self._camera_x - dx, y=self._camera_y - dy)
+
+    def set_camera(self, x: float, y: float):
+        self._camera_x, self._camera_y = x, y
+        rel_x, rel_y = x - self.grid_origin_x, y - self.grid_origin_y
+        tile_x, tile_y = floor(rel_x / self.tile_width), floor(rel_y / self.tile_height)
+        self.group.x = -(rel_x - tile_x * self.tile_width)
+        self.group.y = -(rel_y - tile_y * self.tile_height)
+        if (tile_x, tile_y) != (self._tile_x, self._tile_y):
+            self._tile_x, self._tile_y = tile_x, tile_y
+            self._rebuild_lines()
+
+    def _rebuild_lines(self):
+        # Line positions are relative to the world position of the tile the camera is in.
+        base_x = self.grid_origin_x + self._tile_x * self.tile_width
+        base_y = self.grid_origin_y + self._tile_y * self.tile_height
+        xmin, xmax = 0, (self.n_vertical_lines - 1) * self.tile_width
+        ymin, ymax = 0, (self.n_horizontal_lines - 1) * self.tile_height
+        if self.world_bounds is not None:
+            world_xmin, world_ymin, world_xmax, world_ymax = self.world_bounds
+            xmin, xmax = max(xmin, world_xmin - base_x), min(xmax, world_xmax - base_x)
+            ymin, ymax = max(ymin, world_ymin - base_y), min(ymax, world_ymax - base_y)
+
+        vertices = []
+        for row in range(self.n_horizontal_lines):
             y = row * self.tile_height
-            vertex_list = self.batch.add_indexed(
-                2,
-                gl.GL_LINES,
-                None,
-                [0, 1],
-                (
-                    f'v2f/{usage}',
-                    (
-                        0, (self.grid_origin_y+y)%self.grid_height,
-                        self.grid_width, (self.grid_origin_y+y)%self.grid_height
-                    )
-                ),
-                (f'c3B/{usage}', tuple(list(color)*2))
-            )
-            horizontal_vertex_lists.append(vertex_list)
-        vertical_vertex_lists = []
-        for col in range(n_cols+1):
+            if xmin < xmax and ymin <= y <= ymax:
+                vertices.extend([xmin, y, xmax, y])
+            else:
+                vertices.extend([0, 0, 0, 0])
+        for col in range(self.n_vertical_lines):
             x = col * self.tile_width
-            vertex_list = self.batch.add_indexed(
-                2,
-                gl.GL_LINES,
-                None,
-                [0, 1],
-                (
-                    f'v2f/{usage}',
-                    (
-                        (self.grid_origin_x+x)%self.grid_width, 0,
-                        (self.grid_origin_x+x)%self.grid_width, self.grid_height
-                    )
-                ),
-                (f'c3B/{usage}', tuple(list(color)*2))
-            )
-            vertical_vertex_lists.append(vertex_list)
-        self._vertex_list_grid.append(horizontal_vertex_lists)
-        self._vertex_list_grid.append(vertical_vertex_lists)
-
-    def vertex_list(self, n: int, orientation: int='horizontal'):
-        check_value(orientation, valid_value_list=['horizontal', 'vertical'])
-        if orientation == 'horizontal':
-            return self._vertex_list_grid[0][n]
-        elif orientation == 'vertical':
-            return self._vertex_list_grid[1][n]
-        else:
-            raise Exception
\ No newline at end of file
+            if ymin < ymax and xmin <= x <= xmax:
+                vertices.extend([x, ymin, x, ymax])
+            else:
+                vertices.extend([0, 0, 0, 0])
+        self._vertex_list.vertices[:] = vertices
@@ -0,0 +1,11 @@
+from .texture import VideoTexture
+from .source import FrameSource, Cv2FileSource, ImageSequenceSource, SyntheticSource, open_frame_source
+from .pool import PooledFrame, FrameBufferPool
+from .decoder import FrameDecoder
+from .clock import PLAYBACK_SPEEDS, PlaybackClock, FrameScheduler
+from .seek_index import KeyframeIndex, build_keyframe_index, load_keyframe_index
+from .resize import FrameResizer, fit_size
+from .frame_cache import FrameCache
+from .panel import VideoFrame, VideoPanel
+from .workers import DecodeStream, DecodeWorkerPool
+from .wall import VideoWall
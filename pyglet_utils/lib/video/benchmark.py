@@ -0,0 +1,110 @@
+from __future__ import annotations
+from typing import List
+import time
+import argparse
+import pyglet.gl as gl
+from pyglet.window import Window
+
+from ..basic import BasicObject
+from ..gl_state import gl_state
+from .source import FrameSource, open_frame_source
+from .decoder import FrameDecoder
+from .panel import VideoPanel
+
+class _Viewport(BasicObject):
+    def close(self):
+        pass
+
+def _mean_ms(durations: List[float]) -> float:
+    return 1000 * sum(durations) / len(durations) if len(durations) > 0 else 0.0
+
+def benchmark_pipeline(
+    source: FrameSource, num_frames: int=300, display_size: (int, int)=(1280, 720), queue_size: int=4,
+    warmup_frames: int=10, window: Window=None
+) -> dict:
+    '''
+    Pushes frames through decode -> upload -> draw as fast as they come, without a playback clock or vsync.
+    A hidden window is created for the GL context unless one is given.
+    '''
+    own_window = window is None
+    if own_window:
+        window = Window(width=display_size[0], height=display_size[1], visible=False)
+    window.switch_to()
+    window.on_resize(*display_size)
+    decoder = FrameDecoder(source=source, queue_size=queue_size, loop=True)
+    panel = VideoPanel(
+        relative_x=0, relative_y=0, width=display_size[0], height=display_size[1],
+        parent=_Viewport(x=0, y=0, width=display_size[0], height=display_size[1]), decoder=decoder
+    )
+    # Frames are pulled as fast as possible, so none of them should be treated as late.
+    decoder.clock = None
+    wait_times, upload_times, draw_times = [], [], []
+    decoder.start()
+    try:
+        for i in range(warmup_frames + num_frames):
+            if i == warmup_frames:
+                start_time = time.perf_counter()
+            t0 = time.perf_counter()
+            frame = decoder.get_frame()
+            while frame is None:
+                time.sleep(0.0005)
+                frame = decoder.get_frame()
+            t1 = time.perf_counter()
+            panel.present(frame)
+            gl.glFinish()
+            t2 = time.perf_counter()
+            window.clear()
+            panel.draw()
+            gl.glFinish()
+            t3 = time.perf_counter()
+            if i >= warmup_frames:
+                wait_times.append(t1 - t0)
+                upload_times.append(t2 - t1)
+                draw_times.append(t3 - t2)
+        elapsed = time.perf_counter() - start_time
+    finally:
+        decoder.close()
+        panel.delete()
+        gl_state.invalidate()
+        if own_window:
+            window.close()
+    return {
+        'frames': num_frames,
+        'source_size': (source.width, source.height),
+        'target_size': decoder.target_size,
+        'fps': num_frames / elapsed if elapsed > 0 else 0.0,
+        'wait_ms': _mean_ms(wait_times),
+        'upload_ms': _mean_ms(upload_times),
+        'draw_ms': _mean_ms(draw_times),
+        'decoder': decoder.stats
+    }
+
+def format_benchmark_result(result: dict) -> str:
+    return (
+        f"{result['frames']} frames {result['source_size'][0]}x{result['source_size'][1]}"
+        f" -> {result['target_size'][0]}x{result['target_size'][1]}: {result['fps']:.1f} fps"
+        f" | wait {result['wait_ms']:.2f}ms upload {result['upload_ms']:.2f}ms draw {result['draw_ms']:.2f}ms"
+        f" | underruns {result['decoder']['underruns']} pool peak {result['decoder']['pool']['peak_in_use']}"
+    )
+
+def main(args: List[str]=None):
+    parser = argparse.ArgumentParser(description='Benchmark the video decode -> upload -> draw path without a display loop.')
+    parser.add_argument(
+        'src', nargs='?', default=None,
+        help='Video file, image directory, glob of images, or synthetic[:WxH]. Defaults to a synthetic source.'
+    )
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--display', default='1280x720', help='Size of the panel the frames are drawn into.')
+    parser.add_argument('--queue-size', type=int, default=4)
+    parser.add_argument('--fps', type=float, default=None, help='Frame rate of image sequence and synthetic sources.')
+    parsed = parser.parse_args(args)
+
+    display_size = tuple([int(val) for val in parsed.display.lower().split('x')])
+    source = open_frame_source(parsed.src, fps=parsed.fps)
+    result = benchmark_pipeline(
+        source=source, num_frames=parsed.frames, display_size=display_size, queue_size=parsed.queue_size
+    )
+    print(format_benchmark_result(result))
+
+if __name__ == '__main__':
+    main()
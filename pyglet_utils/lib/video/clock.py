@@ -0,0 +1,194 @@
+from __future__ import annotations
+import time
+
+from .pool import PooledFrame
+from .decoder import FrameDecoder
+
+MIN_PLAYBACK_SPEED = 0.25
+MAX_PLAYBACK_SPEED = 16.0
+PLAYBACK_SPEEDS = [0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0]
+
+class PlaybackClock:
+    def __init__(self, fps: float, frame_count: int=None, loop: bool=True):
+        self.fps = fps
+        self.frame_count = frame_count
+        self.loop = loop
+        self._anchor_time = time.perf_counter()
+        self._anchor_frame = 0.0
+        self._paused_at = None
+        self._rate = 1.0
+
+    @property
+    def rate(self) -> float:
+        '''Playback speed. 2.0 plays twice as fast as the source frame rate.'''
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float):
+        if rate <= 0:
+            raise ValueError(f'rate must be positive. Got {rate}')
+        if self._paused_at is None:
+            # Re-anchored so that the position doesn't jump.
+            self._anchor_frame = self.position
+            self._anchor_time = time.perf_counter()
+        self._rate = rate
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused_at is not None
+
+    @property
+    def position(self) -> float:
+        '''Presentation timestamp in frames. Fractional values are between two frames.'''
+        if self._paused_at is not None:
+            return self._paused_at
+        return self._anchor_frame + (time.perf_counter() - self._anchor_time) * self.fps * self._rate
+
+    @property
+    def frame_idx(self) -> int:
+        frame_idx = int(self.position)
+        if self.frame_count is not None:
+            frame_idx = frame_idx % self.frame_count if self.loop else min(frame_idx, self.frame_count - 1)
+        return frame_idx
+
+    @property
+    def timestamp(self) -> float:
+        return self.frame_idx / self.fps
+
+    def offset(self, frame_idx: int) -> int:
+        '''How many frames frame_idx is ahead of the clock (negative if it is late).'''
+        offset = frame_idx - self.frame_idx
+        if self.loop and self.frame_count is not None:
+            # Across the loop point the shorter way around is the right one.
+            half = self.frame_count // 2
+            offset = (offset + half) % self.frame_count - half
+        return offset
+
+    def seek(self, frame_idx: int):
+        self._anchor_time = time.perf_counter()
+        self._anchor_frame = float(frame_idx)
+        if self._paused_at is not None:
+            self._paused_at = float(frame_idx)
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.position
+
+    def resume(self):
+        if self._paused_at is not None:
+            self.seek(self._paused_at)
+            self._paused_at = None
+
+    def toggle_pause(self):
+        if self.is_paused:
+            self.resume()
+        else:
+            self.pause()
+
+class FrameScheduler:
+    def __init__(self, decoder: FrameDecoder, clock: PlaybackClock=None, keyframe_speed: float=None):
+        '''
+        From keyframe_speed up, fast playback only shows keyframes. Nothing in between gets decoded, but frames
+        are then spaced by the file's keyframe interval rather than by the speed. None keeps every step equal
+        to the speed.
+        '''
+        self.decoder = decoder
+        self.keyframe_speed = keyframe_speed
+        self.clock = clock if clock is not None else PlaybackClock(
+            fps=decoder.source.fps, frame_count=decoder.source.frame_count, loop=decoder.loop
+        )
+        # The decoder thread grabs without retrieving frames that the clock has already passed.
+        decoder.clock = self.clock
+        self._pending = None
+        # A seek while paused still shows the frame it lands on.
+        self._show_next = False
+        self.current_frame_idx = None
+
+        # Stats
+        self.num_presented = 0
+        self.num_dropped_late = 0
+        self.num_duplicated = 0
+
+    @property
+    def num_dropped(self) -> int:
+        return self.num_dropped_late + self.decoder.num_skipped
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'presented': self.num_presented,
+            'dropped': self.num_dropped,
+            'dropped_in_decoder': self.decoder.num_skipped,
+            'duplicated': self.num_duplicated,
+            'speed': self.clock.rate
+        }
+
+    @property
+    def speed(self) -> float:
+        return self.clock.rate
+
+    def set_speed(self, speed: float):
+        if not (MIN_PLAYBACK_SPEED <= speed <= MAX_PLAYBACK_SPEED):
+            raise ValueError(f'speed must be between {MIN_PLAYBACK_SPEED} and {MAX_PLAYBACK_SPEED}. Got {speed}')
+        self.clock.rate = speed
+        # Frames are retrieved at about the source frame rate however fast the clock runs. With cv2 the skipped
+        # frames are still decoded in grab(), so only the conversion, resize and upload of those is saved.
+        keyframes_only = self.keyframe_speed is not None and speed >= self.keyframe_speed
+        self.decoder.set_frame_step(max(int(speed), 1), keyframes_only=keyframes_only)
+
+    def seek(self, frame_idx: int, exact: bool=True):
+        if self._pending is not None:
+            self._pending.release()
+            self._pending = None
+        # Inexact seeks land on a keyframe, and the clock is anchored there so that nothing gets dropped as late.
+        frame_idx = self.decoder.source.get_seek_position(frame_idx, exact=exact)
+        self.clock.seek(frame_idx)
+        self.decoder.seek(frame_idx)
+        self._show_next = True
+
+    def resume_from(self, frame_idx: int):
+        '''For when frame_idx was put on screen without the decoder. Decoding picks up at the frame after it.'''
+        if self._pending is not None:
+            self._pending.release()
+            self._pending = None
+        next_frame_idx = frame_idx + 1
+        frame_count = self.decoder.source.frame_count
+        if frame_count is not None and next_frame_idx >= frame_count:
+            next_frame_idx = 0 if self.decoder.loop else frame_count - 1
+        self.clock.seek(frame_idx)
+        self.decoder.seek(next_frame_idx)
+        self._show_next = False
+        self.current_frame_idx = frame_idx
+
+    def update(self) -> PooledFrame:
+        '''
+        Returns the frame that is due now, or None if the frame on screen should stay.
+        The caller releases the returned frame after using it.
+        '''
+        if self.clock.is_paused and not self._show_next:
+            return None
+        due_frame = None
+        while True:
+            frame = self._pending if self._pending is not None else self.decoder.get_frame()
+            self._pending = None
+            if frame is None:
+                break
+            offset = self.clock.offset(frame.frame_idx)
+            if offset > 0:
+                # Not due yet. Keep it for a later tick.
+                self._pending = frame
+                break
+            if due_frame is not None:
+                due_frame.release()
+                self.num_dropped_late += 1
+            due_frame = frame
+            if offset == 0:
+                break
+        if due_frame is None:
+            if self.current_frame_idx is not None:
+                self.num_duplicated += 1
+            return None
+        self._show_next = False
+        self.num_presented += 1
+        self.current_frame_idx = due_frame.frame_idx
+        return due_frame
@@ -0,0 +1,255 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from threading import Thread, Event, Lock
+from queue import Queue, Empty, Full
+import numpy as np
+
+from .source import FrameSource
+from .pool import PooledFrame, FrameBufferPool
+from .resize import FrameResizer, fit_size
+
+if TYPE_CHECKING:
+    from .clock import PlaybackClock
+
+class FrameDecoder:
+    def __init__(self, source: FrameSource, queue_size: int=4, loop: bool=True, clock: PlaybackClock=None):
+        self.source = source
+        self.queue_size = queue_size
+        self.loop = loop
+        self.clock = clock
+
+        # Besides the queued frames, the renderer holds the frame it's showing and the thread holds the one it's filling.
+        self.pool = FrameBufferPool(capacity=queue_size + 2, shape=source.frame_shape)
+        self._ready = Queue(maxsize=queue_size)
+
+        # Frames are downscaled on the decoder thread to the size they are displayed at.
+        self._target_size = (source.width, source.height)
+        self._resizer = None
+        self._scratch = None
+
+        self._thread = None
+        self._stop_event = Event()
+        self._lock = Lock()
+        self._generation = 0
+        self._seek_request = None
+        self.is_finished = False
+
+        # Fast playback decodes every frame_step-th frame and jumps over the rest in the source.
+        self._frame_step = 1
+        self._keyframes_only = False
+        self._last_frame_idx = None
+
+        # Stats
+        self.num_decoded = 0
+        self.num_delivered = 0
+        self.num_underruns = 0
+        self.num_skipped = 0
+        self.num_retargets = 0
+        self.num_jumps = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._ready.qsize()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'queue_depth': self.queue_depth,
+            'queue_size': self.queue_size,
+            'decoded': self.num_decoded,
+            'delivered': self.num_delivered,
+            'underruns': self.num_underruns,
+            'skipped': self.num_skipped,
+            'target_size': self._target_size,
+            'frame_step': self._frame_step,
+            'keyframes_only': self._keyframes_only,
+            'jumps': self.num_jumps,
+            'pool': self.pool.stats
+        }
+
+    @property
+    def target_size(self) -> (int, int):
+        return self._target_size
+
+    def set_target_size(self, width: int, height: int):
+        target_size = fit_size((self.source.width, self.source.height), (width, height))
+        with self._lock:
+            if target_size != self._target_size:
+                self._target_size = target_size
+                self.pool.shape = (target_size[1], target_size[0]) + tuple(self.source.frame_shape[2:])
+                self.num_retargets += 1
+
+    @property
+    def frame_step(self) -> int:
+        return self._frame_step
+
+    def set_frame_step(self, frame_step: int, keyframes_only: bool=False):
+        '''
+        Only every frame_step-th frame is retrieved, resized and queued. How much the frames in between cost
+        depends on the source: Cv2FileSource still decodes each of them in grab().
+        keyframes_only moves each target up to the next keyframe so that nothing in between is decoded, but then
+        the step follows the file's keyframe spacing instead of frame_step.
+        '''
+        if frame_step < 1:
+            raise ValueError(f'frame_step must be at least 1. Got {frame_step}')
+        with self._lock:
+            self._frame_step = frame_step
+            self._keyframes_only = keyframes_only
+
+    def _skip_ahead(self, frame_idx: int, keyframes_only: bool):
+        frame_count = self.source.frame_count
+        if frame_count is not None and frame_idx >= frame_count:
+            if not self.loop:
+                return
+            frame_idx %= frame_count
+        if keyframes_only:
+            keyframe = self.source.get_next_keyframe(frame_idx)
+            if keyframe is None:
+                if not self.loop:
+                    return
+                keyframe = 0
+            frame_idx = keyframe
+        if frame_idx != self.source.position:
+            # The source decides how to get there. Cv2FileSource grabs forward, jumping to a keyframe first when
+            # that is shorter.
+            self.source.seek(frame_idx)
+            self.num_jumps += 1
+
+    def _decode_into(self, buffer: np.ndarray, target_size: (int, int)) -> np.ndarray:
+        if target_size == (self.source.width, self.source.height):
+            return self.source.retrieve(out=buffer)
+        if self._resizer is None or self._resizer.dst_size != target_size:
+            self._resizer = FrameResizer(src_size=(self.source.width, self.source.height), dst_size=target_size)
+        if self._scratch is None:
+            self._scratch = np.empty(self.source.frame_shape, dtype=np.uint8)
+        src = self.source.retrieve(out=self._scratch)
+        if src is None:
+            return None
+        return self._resizer.resize(src, out=buffer)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def close(self):
+        self.stop()
+        self.source.close()
+
+    def seek(self, frame_idx: int):
+        # Frames that were decoded before the seek are dropped by generation instead of synchronizing with the thread.
+        with self._lock:
+            self._generation += 1
+            self._seek_request = frame_idx
+        self.is_finished = False
+        self._drain()
+
+    def _drain(self):
+        while True:
+            try:
+                frame = self._ready.get_nowait()
+            except Empty:
+                break
+            frame.release()
+
+    def _acquire_frame(self) -> PooledFrame:
+        while not self._stop_event.is_set():
+            frame = self.pool.acquire(timeout=0.1)
+            if frame is not None:
+                return frame
+        return None
+
+    def _put_ready(self, frame: PooledFrame) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self._ready.put(frame, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    @property
+    def wants_frame(self) -> bool:
+        # True when a step() would have somewhere to put its frame.
+        return not self.is_finished and not self._ready.full() and self.pool.num_free > 0
+
+    def step(self, frame: PooledFrame) -> bool:
+        '''
+        Grabs the next frame from the source and decodes it into frame, which ends up queued or released.
+        Returns False if the source has ended. Only one thread may step a decoder at a time.
+        '''
+        with self._lock:
+            generation = self._generation
+            seek_request, self._seek_request = self._seek_request, None
+            target_size = self._target_size
+            frame_step, keyframes_only = self._frame_step, self._keyframes_only
+        if frame.buffer.shape[:2] != (target_size[1], target_size[0]):
+            # Acquired before a retarget. The pool swaps it for the new size on its next trip.
+            frame.release()
+            return True
+        if seek_request is not None:
+            self.source.seek(seek_request)
+            self._last_frame_idx = None
+        elif frame_step > 1 and self._last_frame_idx is not None:
+            self._skip_ahead(self._last_frame_idx + frame_step, keyframes_only)
+        frame_idx = self.source.position
+        if not self.source.grab():
+            frame.release()
+            if self.loop and self.source.is_seekable:
+                self.source.seek(0)
+                return True
+            self.is_finished = True
+            return False
+        self.is_finished = False
+        self._last_frame_idx = frame_idx
+        if self.clock is not None and self.clock.offset(frame_idx) < -frame_step:
+            # The frame is already late, so it is grabbed but never retrieved.
+            frame.release()
+            self.num_skipped += 1
+            return True
+        frame.data = self._decode_into(frame.buffer, target_size)
+        if frame.data is None:
+            frame.release()
+            return True
+        self.num_decoded += 1
+        frame.frame_idx = frame_idx
+        frame.timestamp = frame_idx / self.source.fps
+        frame.generation = generation
+        if not self._put_ready(frame):
+            frame.release()
+        return True
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            frame = self._acquire_frame()
+            if frame is None:
+                break
+            if not self.step(frame):
+                self._stop_event.wait(0.01)
+
+    def get_frame(self) -> PooledFrame:
+        '''Returns the next decoded frame or None if the decoder hasn't caught up. Call release() on it when done.'''
+        while True:
+            try:
+                frame = self._ready.get_nowait()
+            except Empty:
+                if not self.is_finished:
+                    self.num_underruns += 1
+                return None
+            if frame.generation == self._generation:
+                self.num_delivered += 1
+                return frame
+            frame.release()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from collections import OrderedDict
+import numpy as np
+
+class FrameCache:
+    def __init__(self, max_bytes: int=256 * 1024 * 1024):
+        '''
+        Keeps copies of recently displayed frames by frame index, least recently used first out,
+        so that short rewinds don't have to go through the decoder.
+        '''
+        self._max_bytes = max_bytes
+        self._frames = OrderedDict()
+        self._shape = None
+        self.nbytes = 0
+
+        # Stats
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_evictions = 0
+        self.num_allocations = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, frame_idx: int) -> bool:
+        return frame_idx in self._frames
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        while self.nbytes > self._max_bytes:
+            self._evict()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'frames': len(self._frames),
+            'bytes': self.nbytes,
+            'max_bytes': self._max_bytes,
+            'hits': self.num_hits,
+            'misses': self.num_misses,
+            'evictions': self.num_evictions,
+            'allocations': self.num_allocations
+        }
+
+    def _evict(self) -> np.ndarray:
+        _, buffer = self._frames.popitem(last=False)
+        self.nbytes -= buffer.nbytes
+        self.num_evictions += 1
+        return buffer
+
+    def get(self, frame_idx: int) -> np.ndarray:
+        '''Returns None on a miss. The returned array belongs to the cache and is only valid until the next put().'''
+        buffer = self._frames.get(frame_idx)
+        if buffer is None:
+            self.num_misses += 1
+            return None
+        self._frames.move_to_end(frame_idx)
+        self.num_hits += 1
+        return buffer
+
+    def put(self, frame_idx: int, data: np.ndarray):
+        if self._shape is not None and data.shape != self._shape:
+            # The display size changed. Old frames would force a texture reallocation when shown.
+            self.clear()
+        if frame_idx in self._frames:
+            self._frames.move_to_end(frame_idx)
+            return
+        if data.nbytes > self._max_bytes:
+            return
+        self._shape = data.shape
+        buffer = None
+        while self.nbytes + data.nbytes > self._max_bytes:
+            # Every cached frame has the same shape, so the evicted buffer is reused for the copy.
+            buffer = self._evict()
+        if buffer is None:
+            buffer = np.empty_like(data)
+            self.num_allocations += 1
+        np.copyto(buffer, data)
+        self._frames[frame_idx] = buffer
+        self.nbytes += buffer.nbytes
+
+    def clear(self):
+        self._frames.clear()
+        self._shape = None
+        self.nbytes = 0
@@ -0,0 +1,184 @@
+from __future__ import annotations
+from typing import Tuple, cast
+import numpy as np
+
+from ..basic import BasicObject
+from ..panel import Panel
+from .texture import VideoTexture
+from .pool import PooledFrame
+from .decoder import FrameDecoder
+from .clock import PLAYBACK_SPEEDS, FrameScheduler
+from .resize import fit_size
+from .frame_cache import FrameCache
+
+class VideoFrame(BasicObject):
+    def __init__(self, x: int, y: int, width: int, height: int, color_order: str='BGR'):
+        super().__init__(x=x, y=y, width=width, height=height)
+        self.color_order = color_order
+        self.video_texture = cast(VideoTexture, None)
+
+    @property
+    def has_frame(self) -> bool:
+        return self.video_texture is not None
+
+    @property
+    def orig_aspect_ratio(self) -> float:
+        return self.video_texture.aspect_ratio
+
+    @property
+    def num_uploads(self) -> int:
+        return self.video_texture.num_uploads if self.video_texture is not None else 0
+
+    def set_frame(self, frame: np.ndarray):
+        if frame is None:
+            return
+        if self.video_texture is None:
+            channels = 1 if frame.ndim == 2 else frame.shape[2]
+            self.video_texture = VideoTexture(
+                width=frame.shape[1], height=frame.shape[0], channels=channels, color_order=self.color_order
+            )
+        self.video_texture.update(frame)
+
+    def draw(self):
+        if self.video_texture is not None:
+            self.video_texture.draw(x=self.x, y=self.y, width=self.width, height=self.height)
+
+    def delete(self):
+        if self.video_texture is not None:
+            self.video_texture.delete()
+            self.video_texture = None
+
+class VideoPanel(Panel):
+    def __init__(
+        self, relative_x: int, relative_y: int, width: int, height: int, parent, decoder: FrameDecoder,
+        scheduler: FrameScheduler=None, bg_color: Tuple[int]=(0,0,0), allow_upscale: bool=True,
+        close_on_finish: bool=False, frame_cache: FrameCache=None
+    ):
+        super().__init__(
+            relative_x=relative_x, relative_y=relative_y,
+            width=width, height=height,
+            parent=parent,
+            bg_color=bg_color, bg_transparency=255
+        )
+        self.decoder = decoder
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler(decoder=decoder)
+        self.allow_upscale = allow_upscale
+        self.close_on_finish = close_on_finish
+        self.frame_cache = frame_cache
+        # Set when the frame on screen came from the cache while paused and the decoder is still somewhere else.
+        self._decoder_behind = False
+        self.frame = VideoFrame(
+            x=self.x, y=self.y, width=width, height=height, color_order=decoder.source.color_order
+        )
+        self.frame_idx = None
+        self._layout = None
+        self.update_layout()
+
+    @property
+    def source_aspect_ratio(self) -> float:
+        return self.decoder.source.width / self.decoder.source.height
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'frame_idx': self.frame_idx,
+            'uploads': self.frame.num_uploads,
+            'scheduler': self.scheduler.stats,
+            'decoder': self.decoder.stats,
+            'cache': self.frame_cache.stats if self.frame_cache is not None else None
+        }
+
+    def update_layout(self):
+        # The frame is letterboxed in the panel. Called from draw(), so resizing or moving the panel is enough.
+        layout = (self.x, self.y, self.width, self.height)
+        if layout == self._layout:
+            return
+        self._layout = layout
+        source = self.decoder.source
+        frame_width, frame_height = fit_size(
+            (source.width, source.height), (max(self.width, 1), max(self.height, 1)),
+            allow_upscale=self.allow_upscale
+        )
+        self.frame.shape = (frame_width, frame_height)
+        self.frame.position = (self.x + (self.width - frame_width) // 2, self.y + (self.height - frame_height) // 2)
+        # The decoder thread downscales to the displayed size, so uploads shrink with the panel.
+        self.decoder.set_target_size(frame_width, frame_height)
+
+    def present(self, frame: PooledFrame):
+        self.frame.set_frame(frame.data)
+        self.frame_idx = frame.frame_idx
+        if self.frame_cache is not None:
+            self.frame_cache.put(frame.frame_idx, frame.data)
+        # The texture upload copies the pixels, so the buffer can go straight back to the pool.
+        frame.release()
+
+    def next_frame(self) -> bool:
+        '''Uploads the frame that is due now. Returns False if the frame on screen stays.'''
+        frame = self.scheduler.update()
+        if frame is None:
+            if self.close_on_finish and self.decoder.is_finished and self.decoder.queue_depth == 0:
+                self.close()
+            return False
+        self.present(frame)
+        return True
+
+    def _show_cached(self, frame_idx: int) -> bool:
+        data = self.frame_cache.get(frame_idx) if self.frame_cache is not None else None
+        if data is None:
+            return False
+        self.frame.set_frame(data)
+        self.frame_idx = frame_idx
+        if self.scheduler.clock.is_paused:
+            # The decoder is left alone until playback resumes.
+            self.scheduler.clock.seek(frame_idx)
+            self._decoder_behind = True
+        else:
+            self.scheduler.resume_from(frame_idx)
+        return True
+
+    def seek(self, frame_idx: int, exact: bool=True):
+        if self._show_cached(frame_idx):
+            return
+        self.scheduler.seek(frame_idx, exact=exact)
+        self._decoder_behind = False
+
+    def step(self, num_frames: int=1):
+        '''Pauses and moves num_frames away from the frame on screen. Negative steps go back.'''
+        self.scheduler.clock.pause()
+        if self.frame_idx is None:
+            return
+        frame_idx = max(self.frame_idx + num_frames, 0)
+        frame_count = self.decoder.source.frame_count
+        if frame_count is not None:
+            frame_idx = min(frame_idx, frame_count - 1)
+        if frame_idx != self.frame_idx:
+            self.seek(frame_idx, exact=True)
+
+    @property
+    def speed(self) -> float:
+        return self.scheduler.speed
+
+    def set_speed(self, speed: float):
+        self.scheduler.set_speed(speed)
+
+    def change_speed(self, num_steps: int=1) -> float:
+        '''Moves num_steps through PLAYBACK_SPEEDS from the current speed. Returns the new speed.'''
+        idx = min(range(len(PLAYBACK_SPEEDS)), key=lambda i: abs(PLAYBACK_SPEEDS[i] - self.speed))
+        speed = PLAYBACK_SPEEDS[min(max(idx + num_steps, 0), len(PLAYBACK_SPEEDS) - 1)]
+        self.set_speed(speed)
+        return speed
+
+    def toggle_pause(self):
+        clock = self.scheduler.clock
+        if clock.is_paused and self._decoder_behind:
+            self.scheduler.resume_from(self.frame_idx)
+            self._decoder_behind = False
+        clock.toggle_pause()
+
+    def draw(self):
+        self.update_layout()
+        super().draw()
+        self.frame.draw()
+
+    def delete(self):
+        self.frame.delete()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from typing import List
+from threading import Lock
+from queue import Queue, Empty
+import numpy as np
+
+class PooledFrame:
+    def __init__(self, pool: FrameBufferPool, shape: tuple):
+        self.pool = pool
+        self.buffer = np.empty(shape, dtype=pool.dtype)
+        self.data = None
+        self.frame_idx = None
+        self.timestamp = None
+        self.generation = None
+        self.in_use = False
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes
+
+    def release(self):
+        # Hands the buffer back to the pool so that it can be filled again.
+        if self.in_use:
+            self.pool.release(self)
+
+class FrameBufferPool:
+    def __init__(self, capacity: int, shape: tuple, dtype: type=np.uint8):
+        self.capacity = capacity
+        self.dtype = dtype
+        self._shape = tuple(shape)
+        self._lock = Lock()
+        self._frames = [PooledFrame(pool=self, shape=self._shape) for i in range(capacity)]
+        self._free = Queue()
+        for frame in self._frames:
+            self._free.put(frame)
+
+        # Stats
+        self.num_in_use = 0
+        self.peak_in_use = 0
+        self.num_acquired = 0
+        self.num_exhausted = 0
+        self.num_allocations = capacity
+
+    @property
+    def shape(self) -> tuple:
+        return self._shape
+
+    @shape.setter
+    def shape(self, shape: tuple):
+        # Buffers are only reallocated when they come back through acquire(), so frames in flight stay valid.
+        with self._lock:
+            self._shape = tuple(shape)
+
+    @property
+    def num_free(self) -> int:
+        return self.capacity - self.num_in_use
+
+    @property
+    def nbytes(self) -> int:
+        return sum([frame.nbytes for frame in self._frames])
+
+    @property
+    def frames(self) -> List[PooledFrame]:
+        return list(self._frames)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'in_use': self.num_in_use,
+            'free': self.num_free,
+            'peak_in_use': self.peak_in_use,
+            'exhausted': self.num_exhausted,
+            'allocations': self.num_allocations,
+            'bytes': self.nbytes
+        }
+
+    def acquire(self, timeout: float=None) -> PooledFrame:
+        '''Returns None if no buffer frees up within timeout.'''
+        try:
+            frame = self._free.get_nowait()
+        except Empty:
+            self.num_exhausted += 1
+            try:
+                frame = self._free.get(timeout=timeout)
+            except Empty:
+                return None
+        with self._lock:
+            if frame.buffer.shape != self._shape:
+                frame.buffer = np.empty(self._shape, dtype=self.dtype)
+                self.num_allocations += 1
+            frame.in_use = True
+            self.num_in_use += 1
+            self.num_acquired += 1
+            self.peak_in_use = max(self.peak_in_use, self.num_in_use)
+        return frame
+
+    def release(self, frame: PooledFrame):
+        with self._lock:
+            if not frame.in_use:
+                return
+            frame.in_use = False
+            frame.data = None
+            self.num_in_use -= 1
+        self._free.put(frame)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+import numpy as np
+
+from common_utils.check_utils import check_value
+
+class FrameResizer:
+    def __init__(self, src_size: (int, int), dst_size: (int, int), interpolation: str='area'):
+        check_value(interpolation, valid_value_list=['nearest', 'linear', 'area'])
+        self.src_size = src_size
+        self.dst_size = dst_size
+        self.interpolation = interpolation
+        try:
+            import cv2
+            self._cv2 = cv2
+            self._cv2_interpolation = {
+                'nearest': cv2.INTER_NEAREST, 'linear': cv2.INTER_LINEAR, 'area': cv2.INTER_AREA
+            }[interpolation]
+        except ImportError:
+            # Without cv2 the frame is sampled with precomputed nearest neighbour indices.
+            self._cv2 = None
+            src_width, src_height = src_size
+            dst_width, dst_height = dst_size
+            self._rows = ((np.arange(dst_height) + 0.5) * src_height / dst_height).astype(np.intp)
+            self._cols = ((np.arange(dst_width) + 0.5) * src_width / dst_width).astype(np.intp)
+            # Holds the sampled rows between the two takes. Allocated on the first frame, when the channels are known.
+            self._row_buffer = None
+
+    @property
+    def is_identity(self) -> bool:
+        return tuple(self.src_size) == tuple(self.dst_size)
+
+    def resize(self, src: np.ndarray, out: np.ndarray) -> np.ndarray:
+        if self._cv2 is not None:
+            return self._cv2.resize(src, tuple(self.dst_size), dst=out, interpolation=self._cv2_interpolation)
+        row_shape = (len(self._rows),) + src.shape[1:]
+        if self._row_buffer is None or self._row_buffer.shape != row_shape or self._row_buffer.dtype != src.dtype:
+            self._row_buffer = np.empty(row_shape, dtype=src.dtype)
+        np.take(src, self._rows, axis=0, out=self._row_buffer)
+        np.take(self._row_buffer, self._cols, axis=1, out=out)
+        return out
+
+def fit_size(src_size: (int, int), max_size: (int, int), allow_upscale: bool=False) -> (int, int):
+    '''Largest size with the aspect ratio of src_size that fits in max_size.'''
+    src_width, src_height = src_size
+    max_width, max_height = max_size
+    scale = min(max_width / src_width, max_height / src_height)
+    if not allow_upscale:
+        scale = min(scale, 1.0)
+    return (max(int(round(src_width * scale)), 1), max(int(round(src_height * scale)), 1))
@@ -0,0 +1,171 @@
+from __future__ import annotations
+from typing import List
+import os
+import json
+import shutil
+import subprocess
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+
+from logger import logger
+
+KEYFRAME_INDEX_VERSION = 2
+
+class KeyframeIndex:
+    def __init__(self, keyframes: List[int], frame_count: int=None, file_size: int=None, file_mtime: float=None):
+        self.keyframes = sorted(set(keyframes)) if len(keyframes) > 0 else [0]
+        if self.keyframes[0] != 0:
+            self.keyframes.insert(0, 0)
+        self.frame_count = frame_count
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+
+    def __len__(self) -> int:
+        return len(self.keyframes)
+
+    @property
+    def max_gop(self) -> int:
+        '''Longest run of frames that has to be decoded to reach any frame.'''
+        bounds = self.keyframes + ([self.frame_count] if self.frame_count is not None else [])
+        return max([end - start for start, end in zip(bounds[:-1], bounds[1:])] + [1])
+
+    def keyframe_before(self, frame_idx: int) -> int:
+        '''The last keyframe at or before frame_idx.'''
+        return self.keyframes[max(bisect_right(self.keyframes, frame_idx) - 1, 0)]
+
+    def keyframe_after(self, frame_idx: int) -> int:
+        '''The first keyframe at or after frame_idx, or None if there is none.'''
+        i = bisect_left(self.keyframes, frame_idx)
+        return self.keyframes[i] if i < len(self.keyframes) else None
+
+    def nearest_keyframe(self, frame_idx: int) -> int:
+        i = bisect_right(self.keyframes, frame_idx)
+        candidates = self.keyframes[max(i - 1, 0):i + 1]
+        return min(candidates, key=lambda keyframe: abs(keyframe - frame_idx))
+
+    def to_dict(self) -> dict:
+        return {
+            'version': KEYFRAME_INDEX_VERSION,
+            'frame_count': self.frame_count,
+            'file_size': self.file_size,
+            'file_mtime': self.file_mtime,
+            'keyframes': self.keyframes
+        }
+
+    @classmethod
+    def from_dict(cls, index_dict: dict) -> KeyframeIndex:
+        return KeyframeIndex(
+            keyframes=index_dict['keyframes'],
+            frame_count=index_dict['frame_count'],
+            file_size=index_dict['file_size'],
+            file_mtime=index_dict['file_mtime']
+        )
+
+    def save(self, path: str):
+        json.dump(self.to_dict(), open(path, 'w'), separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> KeyframeIndex:
+        index_dict = json.load(open(path, 'r'))
+        if index_dict['version'] != KEYFRAME_INDEX_VERSION:
+            raise Exception(f"Unsupported keyframe index version {index_dict['version']} != {KEYFRAME_INDEX_VERSION}")
+        return KeyframeIndex.from_dict(index_dict)
+
+    def matches_file(self, video_path: str) -> bool:
+        stat = os.stat(video_path)
+        return self.file_size == stat.st_size and self.file_mtime == stat.st_mtime
+
+def _scan_keyframes_av(video_path: str) -> (List[int], int):
+    import av
+
+    container = av.open(video_path)
+    try:
+        stream = container.streams.video[0]
+        rate = stream.average_rate or stream.guessed_rate
+        start_pts = stream.start_time if stream.start_time is not None else 0
+        keyframes, frame_count = [], 0
+        # Packets are only demuxed, never decoded.
+        for packet in container.demux(stream):
+            if packet.pts is None:
+                continue
+            frame_count += 1
+            if packet.is_keyframe:
+                keyframes.append(int(round(float((packet.pts - start_pts) * stream.time_base * rate))))
+        return keyframes, frame_count
+    finally:
+        container.close()
+
+def _parse_ffprobe_fraction(value: str) -> Fraction:
+    # ffprobe writes rates and time bases as "num/den", and "0/0" when unknown.
+    num, _, den = value.partition('/')
+    return Fraction(int(num), int(den)) if den not in ['', '0'] else Fraction(num or 0)
+
+def _scan_keyframes_ffprobe(video_path: str) -> (List[int], int):
+    stream_output = subprocess.run(
+        [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=time_base,avg_frame_rate,r_frame_rate,start_pts', '-of', 'json', video_path
+        ],
+        check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    stream = json.loads(stream_output)['streams'][0]
+    time_base = _parse_ffprobe_fraction(stream['time_base'])
+    rate = _parse_ffprobe_fraction(stream.get('avg_frame_rate', '0/0')) or _parse_ffprobe_fraction(stream['r_frame_rate'])
+    start_pts = int(stream['start_pts']) if stream.get('start_pts') not in [None, 'N/A'] else 0
+    output = subprocess.run(
+        [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts,flags', '-of', 'csv=print_section=0', video_path
+        ],
+        check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    keyframes, frame_count = [], 0
+    for line in output.splitlines():
+        pts, _, flags = line.strip().partition(',')
+        if pts in ['', 'N/A']:
+            continue
+        frame_count += 1
+        # Packets come out in decode order, so the display index is worked out from pts like in the PyAV scan.
+        if 'K' in flags:
+            keyframes.append(int(round(float((int(pts) - start_pts) * time_base * rate))))
+    return keyframes, frame_count
+
+def build_keyframe_index(video_path: str) -> KeyframeIndex:
+    '''Returns None if neither PyAV nor ffprobe is available or the scan fails.'''
+    try:
+        try:
+            keyframes, frame_count = _scan_keyframes_av(video_path)
+        except ImportError:
+            if shutil.which('ffprobe') is None:
+                return None
+            keyframes, frame_count = _scan_keyframes_ffprobe(video_path)
+    except Exception as e:
+        # Without an index, seeking still works through cv2, just more slowly.
+        logger.warning(f"Couldn't scan keyframes of {video_path}: {e}")
+        return None
+    stat = os.stat(video_path)
+    return KeyframeIndex(
+        keyframes=keyframes, frame_count=frame_count,
+        file_size=stat.st_size, file_mtime=stat.st_mtime
+    )
+
+def get_keyframe_index_cache_path(video_path: str) -> str:
+    return f'{video_path}.keyframes.json'
+
+def load_keyframe_index(video_path: str, cache_path: str=None, use_cache: bool=True) -> KeyframeIndex:
+    cache_path = cache_path if cache_path is not None else get_keyframe_index_cache_path(video_path)
+    if use_cache and os.path.isfile(cache_path):
+        try:
+            index = KeyframeIndex.load(cache_path)
+            if index.matches_file(video_path):
+                return index
+        except Exception:
+            pass
+    index = build_keyframe_index(video_path)
+    if index is not None and use_cache:
+        try:
+            index.save(cache_path)
+        except OSError:
+            # The video may live somewhere read-only. The index still works from memory.
+            pass
+    return index
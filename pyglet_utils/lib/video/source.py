@@ -0,0 +1,342 @@
+from __future__ import annotations
+from typing import Callable, cast
+import os
+import glob
+from abc import ABCMeta, abstractmethod
+import numpy as np
+
+from .seek_index import KeyframeIndex, load_keyframe_index
+
+class FrameSource(metaclass=ABCMeta):
+    '''
+    Frames are decoded in two steps, like cv2.VideoCapture:
+    grab() advances to the next frame and retrieve() decodes the grabbed frame.
+    Sources that can't separate the two steps may decode in grab().
+    '''
+    color_order = 'BGR'
+
+    @property
+    @abstractmethod
+    def width(self) -> int:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def height(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def channels(self) -> int:
+        return 3
+
+    @property
+    def frame_shape(self) -> (int, int, int):
+        return (self.height, self.width, self.channels)
+
+    @property
+    @abstractmethod
+    def fps(self) -> float:
+        raise NotImplementedError
+
+    @property
+    def frame_count(self) -> int:
+        '''Returns None if the number of frames isn't known.'''
+        return None
+
+    @property
+    @abstractmethod
+    def position(self) -> int:
+        '''Index of the frame that the next grab() will advance to.'''
+        raise NotImplementedError
+
+    @property
+    def is_seekable(self) -> bool:
+        return self.frame_count is not None
+
+    @abstractmethod
+    def grab(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def retrieve(self, out: np.ndarray=None) -> np.ndarray:
+        raise NotImplementedError
+
+    def read(self, out: np.ndarray=None) -> np.ndarray:
+        if not self.grab():
+            return None
+        return self.retrieve(out=out)
+
+    @abstractmethod
+    def seek(self, frame_idx: int):
+        raise NotImplementedError
+
+    def get_seek_position(self, frame_idx: int, exact: bool=True) -> int:
+        '''Where a seek to frame_idx should land. Inexact seeks may land on a cheaper nearby frame.'''
+        return frame_idx
+
+    def get_next_keyframe(self, frame_idx: int) -> int:
+        '''The first frame at or after frame_idx that can be decoded without its predecessors, or None.'''
+        if self.frame_count is not None and frame_idx >= self.frame_count:
+            return None
+        return frame_idx
+
+    def close(self):
+        pass
+
+class Cv2FileSource(FrameSource):
+    color_order = 'BGR'
+
+    def __init__(self, path: str, use_keyframe_index: bool=True, cache_keyframe_index: bool=True):
+        import cv2
+        self._cv2 = cv2
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise IOError(f"Couldn't open video: {path}")
+        self._width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._fps = float(self.capture.get(cv2.CAP_PROP_FPS)) or 30.0
+        frame_count = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._frame_count = frame_count if frame_count > 0 else None
+        self._position = 0
+        self.keyframe_index = cast(KeyframeIndex, None)
+        if use_keyframe_index:
+            self.keyframe_index = load_keyframe_index(path, use_cache=cache_keyframe_index)
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def grab(self) -> bool:
+        # The FFmpeg backend decodes here. retrieve() only converts the colour and copies.
+        if not self.capture.grab():
+            return False
+        self._position += 1
+        return True
+
+    def retrieve(self, out: np.ndarray=None) -> np.ndarray:
+        # cv2 decodes straight into out when its shape and dtype already match.
+        ret, frame = self.capture.retrieve(out) if out is not None else self.capture.retrieve()
+        return frame if ret else None
+
+    def get_seek_position(self, frame_idx: int, exact: bool=True) -> int:
+        if exact or self.keyframe_index is None:
+            return frame_idx
+        return self.keyframe_index.nearest_keyframe(frame_idx)
+
+    def get_next_keyframe(self, frame_idx: int) -> int:
+        if self.keyframe_index is None:
+            return super().get_next_keyframe(frame_idx)
+        return self.keyframe_index.keyframe_after(frame_idx)
+
+    def seek(self, frame_idx: int):
+        if self._frame_count is not None:
+            frame_idx = min(max(frame_idx, 0), self._frame_count - 1)
+        if self.keyframe_index is None:
+            self.capture.set(self._cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            self._position = int(self.capture.get(self._cv2.CAP_PROP_POS_FRAMES))
+            return
+        keyframe = self.keyframe_index.keyframe_before(frame_idx)
+        # Grabbing forward from where we are is cheaper when it's within the same GOP. Either way every frame
+        # from the keyframe on is decoded.
+        if not (keyframe <= self._position <= frame_idx):
+            self.capture.set(self._cv2.CAP_PROP_POS_FRAMES, keyframe)
+            self._position = keyframe
+        while self._position < frame_idx and self.grab():
+            pass
+
+    def close(self):
+        self.capture.release()
+
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff']
+
+class ImageSequenceSource(FrameSource):
+    def __init__(self, paths, fps: float=30.0):
+        '''
+        paths can be a directory, a glob pattern or a list of image paths.
+        Every image has to have the size of the first one.
+        '''
+        if isinstance(paths, str):
+            if os.path.isdir(paths):
+                paths = [
+                    os.path.join(paths, filename) for filename in os.listdir(paths)
+                    if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS
+                ]
+            else:
+                paths = glob.glob(paths)
+            paths = sorted(paths)
+        if len(paths) == 0:
+            raise Exception('No images found for the image sequence.')
+        self.paths = list(paths)
+        self._fps = fps
+        self._position = 0
+        self._grabbed_idx = None
+        try:
+            import cv2
+            self._cv2 = cv2
+            self.color_order = 'BGR'
+        except ImportError:
+            self._cv2 = None
+            self.color_order = 'RGB'
+        first = self._load(self.paths[0])
+        self._height, self._width = first.shape[:2]
+
+    def _load(self, path: str) -> np.ndarray:
+        if self._cv2 is not None:
+            img = self._cv2.imread(path, self._cv2.IMREAD_COLOR)
+            if img is None:
+                raise IOError(f"Couldn't read image: {path}")
+            return img
+        from PIL import Image
+        return np.asarray(Image.open(path).convert('RGB'))
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.paths)
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def grab(self) -> bool:
+        # Images are only read in retrieve(), so grabbed frames that get skipped cost nothing.
+        if self._position >= len(self.paths):
+            return False
+        self._grabbed_idx = self._position
+        self._position += 1
+        return True
+
+    def retrieve(self, out: np.ndarray=None) -> np.ndarray:
+        if self._grabbed_idx is None:
+            return None
+        img = self._load(self.paths[self._grabbed_idx])
+        if img.shape != self.frame_shape:
+            raise Exception(
+                f'{self.paths[self._grabbed_idx]} has shape {img.shape}. Expected {self.frame_shape}'
+            )
+        if out is None:
+            return img
+        np.copyto(out, img)
+        return out
+
+    def seek(self, frame_idx: int):
+        self._position = min(max(frame_idx, 0), len(self.paths) - 1)
+        self._grabbed_idx = None
+
+class SyntheticSource(FrameSource):
+    def __init__(
+        self, width: int=1280, height: int=720, fps: float=30.0, frame_count: int=None,
+        generator: Callable[[int, np.ndarray], None]=None
+    ):
+        '''
+        generator(frame_idx, out) fills out with the frame in place.
+        Without a generator a gradient scrolls across the frame and the top left block encodes frame_idx % 256.
+        frame_count=None makes the source endless.
+        '''
+        self._width = width
+        self._height = height
+        self._fps = fps
+        self._frame_count = frame_count
+        self.generator = generator if generator is not None else self._scrolling_gradient
+        self._position = 0
+        self._grabbed_idx = None
+        self._gradient = None
+        self._cols = None
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @property
+    def is_seekable(self) -> bool:
+        return True
+
+    def _scrolling_gradient(self, frame_idx: int, out: np.ndarray):
+        if self._gradient is None:
+            x = np.linspace(0, 255, self._width, dtype=np.float32)
+            y = np.linspace(0, 255, self._height, dtype=np.float32)[:, None]
+            self._gradient = np.empty(self.frame_shape, dtype=np.uint8)
+            self._gradient[:, :, 0] = x
+            self._gradient[:, :, 1] = y
+            self._gradient[:, :, 2] = 255 - x
+            self._cols = np.arange(self._width)
+        np.take(self._gradient, (self._cols + 4 * frame_idx) % self._width, axis=1, out=out)
+        out[:16, :16] = frame_idx % 256
+
+    def grab(self) -> bool:
+        if self._frame_count is not None and self._position >= self._frame_count:
+            return False
+        self._grabbed_idx = self._position
+        self._position += 1
+        return True
+
+    def retrieve(self, out: np.ndarray=None) -> np.ndarray:
+        if self._grabbed_idx is None:
+            return None
+        out = out if out is not None else np.empty(self.frame_shape, dtype=np.uint8)
+        self.generator(self._grabbed_idx, out)
+        return out
+
+    def seek(self, frame_idx: int):
+        frame_idx = max(frame_idx, 0)
+        if self._frame_count is not None:
+            frame_idx = min(frame_idx, self._frame_count - 1)
+        self._position = frame_idx
+        self._grabbed_idx = None
+
+def open_frame_source(src: str=None, fps: float=None) -> FrameSource:
+    '''
+    src can be a video file, an image directory, a glob pattern of images,
+    or "synthetic" / "synthetic:<width>x<height>". None is the same as "synthetic".
+    '''
+    if src is None or src.startswith('synthetic'):
+        size = src.split(':', 1)[1] if src is not None and ':' in src else '1280x720'
+        width, height = [int(val) for val in size.lower().split('x')]
+        return SyntheticSource(width=width, height=height, fps=fps if fps is not None else 30.0)
+    if os.path.isdir(src) or glob.has_magic(src):
+        return ImageSequenceSource(src, fps=fps if fps is not None else 30.0)
+    return Cv2FileSource(src)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import Tuple
+import ctypes
+import numpy as np
+import pyglet.gl as gl
+from pyglet.graphics import vertex_list
+from pyglet.image import Texture
+
+from common_utils.check_utils import check_value
+from ..gl_state import gl_state
+from ..draw_stats import draw_stats
+
+GL_PIXEL_FORMATS = {
+    ('BGR', 3): gl.GL_BGR,
+    ('RGB', 3): gl.GL_RGB,
+    ('BGR', 4): gl.GL_BGRA,
+    ('RGB', 4): gl.GL_RGBA,
+    ('BGR', 1): gl.GL_LUMINANCE,
+    ('RGB', 1): gl.GL_LUMINANCE
+}
+
+class VideoTexture:
+    def __init__(self, width: int, height: int, channels: int=3, color_order: str='BGR'):
+        check_value(color_order, valid_value_list=['BGR', 'RGB'])
+        check_value(channels, valid_value_list=[1, 3, 4])
+        self.color_order = color_order
+        self.channels = channels
+        self.texture = None
+        self._vertex_list = None
+        self._rect = None
+        self.num_uploads = 0
+        self._allocate(width, height)
+
+    @property
+    def width(self) -> int:
+        return self.texture.width
+
+    @property
+    def height(self) -> int:
+        return self.texture.height
+
+    @property
+    def shape(self) -> (int, int):
+        return (self.width, self.height)
+
+    @property
+    def aspect_ratio(self) -> float:
+        return self.width / self.height
+
+    @property
+    def pixel_format(self) -> int:
+        return GL_PIXEL_FORMATS[(self.color_order, self.channels)]
+
+    def _delete_texture(self):
+        # Non power of two sizes come back as a region of a larger texture, which is the one to delete.
+        getattr(self.texture, 'owner', self.texture).delete()
+        self.texture = None
+
+    def _allocate(self, width: int, height: int):
+        if self.texture is not None:
+            self._delete_texture()
+        # The texture storage is allocated once per frame size and then only ever overwritten.
+        self.texture = Texture.create(width, height, internalformat=gl.GL_RGBA if self.channels == 4 else gl.GL_RGB)
+        u0, v0, _, u1, _, _, _, v1, _ = self.texture.tex_coords[:9]
+        # Decoded frames are stored top row first, so the quad samples the texture upside down instead of
+        # flipping the pixels on the CPU.
+        self._tex_coords = (u0, v1, 0.0, u1, v1, 0.0, u1, v0, 0.0, u0, v0, 0.0)
+        if self._vertex_list is not None:
+            self._vertex_list.tex_coords[:] = self._tex_coords
+
+    def update(self, frame: np.ndarray):
+        if frame.dtype != np.uint8:
+            raise TypeError(f'Expected a uint8 frame. Got {frame.dtype}')
+        channels = 1 if frame.ndim == 2 else frame.shape[2]
+        if channels != self.channels:
+            raise ValueError(f'Expected a frame with {self.channels} channels. Got {channels}')
+        height, width = frame.shape[:2]
+        if (width, height) != self.shape:
+            self._allocate(width, height)
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+        texture = self.texture
+        gl_state.bind_texture(texture.target, texture.id)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, 0)
+        # The numpy buffer is handed to GL directly; no intermediate bytes or ImageData are created.
+        gl.glTexSubImage2D(
+            texture.target, 0, 0, 0, width, height,
+            self.pixel_format, gl.GL_UNSIGNED_BYTE,
+            frame.ctypes.data_as(ctypes.POINTER(gl.GLubyte))
+        )
+        gl_state.unbind_texture(texture.target)
+        self.num_uploads += 1
+
+    def _get_vertices(self, x: float, y: float, width: float, height: float) -> Tuple[float]:
+        return (x, y, x + width, y, x + width, y + height, x, y + height)
+
+    def draw(self, x: float, y: float, width: float=None, height: float=None):
+        width = width if width is not None else self.width
+        height = height if height is not None else self.height
+        rect = (x, y, width, height)
+        if self._vertex_list is None:
+            self._vertex_list = vertex_list(
+                4, ('v2f/dynamic', self._get_vertices(*rect)), ('t3f/static', self._tex_coords),
+                ('c4B/static', (255, 255, 255, 255)*4)
+            )
+            self._rect = rect
+        elif rect != self._rect:
+            self._vertex_list.vertices[:] = self._get_vertices(*rect)
+            self._rect = rect
+        texture = self.texture
+        with draw_stats.section('video'):
+            gl_state.enable(texture.target)
+            gl_state.bind_texture(texture.target, texture.id)
+            self._vertex_list.draw(gl.GL_QUADS)
+            gl_state.unbind_texture(texture.target)
+            gl_state.disable(texture.target)
+
+    def delete(self):
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+            self._vertex_list = None
+        if self.texture is not None:
+            self._delete_texture()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple, cast
+import math
+
+from ..panel import Panel
+from .source import FrameSource
+from .decoder import FrameDecoder
+from .panel import VideoPanel
+from .workers import DecodeStream, DecodeWorkerPool
+
+class VideoWall(Panel):
+    def __init__(
+        self, relative_x: int, relative_y: int, width: int, height: int, parent,
+        num_cols: int=None, spacing: int=2, num_workers: int=None, bg_color: Tuple[int]=(0,0,0)
+    ):
+        '''
+        Lays out one VideoPanel per stream in a grid. num_cols=None picks a roughly square grid.
+        Every stream is decoded by the same DecodeWorkerPool.
+        '''
+        super().__init__(
+            relative_x=relative_x, relative_y=relative_y,
+            width=width, height=height,
+            parent=parent,
+            bg_color=bg_color, bg_transparency=255
+        )
+        self.num_cols = num_cols
+        self.spacing = spacing
+        self.worker_pool = DecodeWorkerPool(num_workers=num_workers)
+        self.video_panels = cast(List[VideoPanel], [])
+        self._streams = cast(Dict[VideoPanel, DecodeStream], {})
+        self._layout = None
+
+    def __len__(self) -> int:
+        return len(self.video_panels)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'workers': self.worker_pool.stats,
+            'streams': [
+                dict(self._streams[video_panel].stats, presented=video_panel.scheduler.num_presented)
+                for video_panel in self.video_panels
+            ]
+        }
+
+    def _get_cell_rects(self, num_cells: int) -> List[Tuple[int]]:
+        num_cols = self.num_cols if self.num_cols is not None else max(math.ceil(math.sqrt(num_cells)), 1)
+        num_rows = max(math.ceil(num_cells / num_cols), 1)
+        cell_width = max((self.width - self.spacing * (num_cols - 1)) // num_cols, 1)
+        cell_height = max((self.height - self.spacing * (num_rows - 1)) // num_rows, 1)
+        rects = []
+        for i in range(num_cells):
+            row, col = divmod(i, num_cols)
+            # The first stream goes in the top left corner.
+            rects.append((
+                col * (cell_width + self.spacing),
+                self.height - (row + 1) * cell_height - row * self.spacing,
+                cell_width, cell_height
+            ))
+        return rects
+
+    def update_layout(self):
+        layout = (self.x, self.y, self.width, self.height, len(self.video_panels))
+        if layout == self._layout:
+            return
+        self._layout = layout
+        for video_panel, (relative_x, relative_y, width, height) in zip(
+            self.video_panels, self._get_cell_rects(len(self.video_panels))
+        ):
+            video_panel.shape = (width, height)
+            video_panel.relative_position = (relative_x, relative_y)
+
+    def add_stream(
+        self, source: FrameSource, priority: int=0, max_fps: float=None, queue_size: int=4, loop: bool=True
+    ) -> VideoPanel:
+        relative_x, relative_y, width, height = self._get_cell_rects(len(self.video_panels) + 1)[-1]
+        decoder = FrameDecoder(source=source, queue_size=queue_size, loop=loop)
+        video_panel = VideoPanel(
+            relative_x=relative_x, relative_y=relative_y, width=width, height=height,
+            parent=self, decoder=decoder
+        )
+        self._streams[video_panel] = self.worker_pool.add(decoder, priority=priority, max_fps=max_fps)
+        self.video_panels.append(video_panel)
+        self.update_layout()
+        return video_panel
+
+    def remove_stream(self, video_panel: VideoPanel):
+        self.worker_pool.remove(video_panel.decoder)
+        video_panel.decoder.close()
+        video_panel.delete()
+        del self._streams[video_panel]
+        self.video_panels.remove(video_panel)
+        self.update_layout()
+
+    def set_priority(self, video_panel: VideoPanel, priority: int):
+        self._streams[video_panel].priority = priority
+
+    def set_max_fps(self, video_panel: VideoPanel, max_fps: float):
+        self.worker_pool.set_max_fps(video_panel.decoder, max_fps)
+
+    def start(self):
+        self.worker_pool.start()
+
+    def next_frame(self) -> int:
+        '''Uploads the frames that are due now. Returns how many panels changed.'''
+        return sum([video_panel.next_frame() for video_panel in self.video_panels])
+
+    def toggle_pause(self):
+        for video_panel in self.video_panels:
+            video_panel.toggle_pause()
+
+    def draw(self):
+        self.update_layout()
+        super().draw()
+        for video_panel in self.video_panels:
+            video_panel.draw()
+
+    def delete(self):
+        # Stops the workers and closes every decoder.
+        self.worker_pool.close()
+        for video_panel in self.video_panels:
+            video_panel.delete()
+        self.video_panels = []
+        self._streams = {}
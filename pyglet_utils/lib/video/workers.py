@@ -0,0 +1,171 @@
+from __future__ import annotations
+from typing import List, cast
+import os
+import time
+from threading import Thread, Event, Condition
+
+from .decoder import FrameDecoder
+
+class DecodeStream:
+    def __init__(self, decoder: FrameDecoder, priority: int=0, max_fps: float=None):
+        self.decoder = decoder
+        self.priority = priority
+        self.max_fps = max_fps
+        self.busy = False
+        self.removed = False
+        self.next_decode_time = 0.0
+        self.last_served_time = 0.0
+        # The next_decode_time that was last counted as capped, so each held back decode is counted once.
+        self.capped_decode_time = None
+
+        # Stats
+        self.num_steps = 0
+        self.num_capped = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'priority': self.priority,
+            'max_fps': self.max_fps,
+            'steps': self.num_steps,
+            'capped': self.num_capped,
+            'decoder': self.decoder.stats
+        }
+
+    def is_ready(self, now: float) -> bool:
+        return not self.busy and not self.removed and now >= self.next_decode_time and self.decoder.wants_frame
+
+    def step(self):
+        frame = self.decoder.pool.acquire(timeout=0)
+        if frame is None:
+            return
+        num_decoded = self.decoder.num_decoded
+        self.decoder.step(frame)
+        self.num_steps += 1
+        if self.max_fps is not None and self.decoder.num_decoded > num_decoded:
+            # Only decoded frames count against the cap. Late frames that were merely grabbed are cheap.
+            self.next_decode_time = time.perf_counter() + 1 / self.max_fps
+
+class DecodeWorkerPool:
+    def __init__(self, num_workers: int=None, idle_wait: float=0.005):
+        '''
+        A fixed set of threads that step many FrameDecoders, so the decode cost of N streams is spread over
+        num_workers cores instead of one thread per stream. Decoders in the pool must not be started themselves.
+        '''
+        self.num_workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+        self.idle_wait = idle_wait
+        self.streams = cast(List[DecodeStream], [])
+        self._condition = Condition()
+        self._stop_event = Event()
+        self._threads = cast(List[Thread], [])
+
+        # Stats
+        self.num_idle_waits = 0
+
+    @property
+    def is_running(self) -> bool:
+        return len(self._threads) > 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'workers': self.num_workers,
+            'streams': len(self.streams),
+            'busy': len([stream for stream in self.streams if stream.busy]),
+            'idle_waits': self.num_idle_waits
+        }
+
+    def add(self, decoder: FrameDecoder, priority: int=0, max_fps: float=None) -> DecodeStream:
+        if decoder.is_running:
+            raise Exception('The decoder already runs on its own thread.')
+        stream = DecodeStream(decoder=decoder, priority=priority, max_fps=max_fps)
+        with self._condition:
+            self.streams.append(stream)
+            self._condition.notify_all()
+        return stream
+
+    def get_stream(self, decoder: FrameDecoder) -> DecodeStream:
+        for stream in self.streams:
+            if stream.decoder is decoder:
+                return stream
+        raise KeyError(f'Decoder is not in the pool: {decoder}')
+
+    def remove(self, decoder: FrameDecoder):
+        '''Blocks until no worker is stepping the decoder, so that it can be closed right after.'''
+        stream = self.get_stream(decoder)
+        with self._condition:
+            stream.removed = True
+            while stream.busy:
+                self._condition.wait()
+            self.streams.remove(stream)
+
+    def set_priority(self, decoder: FrameDecoder, priority: int):
+        self.get_stream(decoder).priority = priority
+
+    def set_max_fps(self, decoder: FrameDecoder, max_fps: float):
+        stream = self.get_stream(decoder)
+        stream.max_fps = max_fps
+        if max_fps is None:
+            stream.next_decode_time = 0.0
+
+    def _next_stream(self, now: float) -> DecodeStream:
+        # Higher priority first. Between equals, the stream with the emptiest queue, then the one served least recently.
+        ready_streams = [stream for stream in self.streams if stream.is_ready(now)]
+        if len(ready_streams) == 0:
+            return None
+        return min(
+            ready_streams,
+            key=lambda stream: (-stream.priority, stream.decoder.queue_depth, stream.last_served_time)
+        )
+
+    def _get_wait_time(self, now: float) -> float:
+        wait_time = self.idle_wait
+        for stream in self.streams:
+            if not stream.busy and not stream.removed and stream.next_decode_time > now and stream.decoder.wants_frame:
+                wait_time = min(wait_time, stream.next_decode_time - now)
+                if stream.capped_decode_time != stream.next_decode_time:
+                    stream.capped_decode_time = stream.next_decode_time
+                    stream.num_capped += 1
+        return max(wait_time, 0.0)
+
+    def _run_worker(self):
+        while not self._stop_event.is_set():
+            with self._condition:
+                now = time.perf_counter()
+                stream = self._next_stream(now)
+                if stream is None:
+                    # Consumers free up queue space without notifying, so idle workers poll.
+                    self.num_idle_waits += 1
+                    self._condition.wait(timeout=self._get_wait_time(now))
+                    continue
+                stream.busy = True
+                stream.last_served_time = now
+            try:
+                stream.step()
+            finally:
+                with self._condition:
+                    stream.busy = False
+                    self._condition.notify_all()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._threads = [Thread(target=self._run_worker, daemon=True) for i in range(self.num_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def close(self):
+        '''Stops the workers and closes every decoder in the pool.'''
+        self.stop()
+        for stream in self.streams:
+            stream.decoder.close()
+        self.streams = []
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from typing import List, Dict, cast
+from weakref import WeakSet, WeakKeyDictionary
+import pyglet
+from pyglet.sprite import Sprite
+from pyglet.graphics import Batch
+from pyglet.image import AbstractImage
+
+from .resources import ResourceAnimation
+
+class AnimationGroup:
+    def __init__(self, res_anim: ResourceAnimation):
+        # No reference to res_anim is kept, so SharedAnimationClock can drop the group once res_anim is gone.
+        self.frames = res_anim.animation.frames
+        self.loop = res_anim.loop
+        self.frame_idx = 0
+        self.sprites = WeakSet()
+        self._running = False
+
+        # When every frame lives in the same texture with the same size, a frame advance is only a
+        # texture coordinate rewrite. Otherwise each sprite has to go through Sprite.image.
+        textures = [frame.image.get_texture() for frame in self.frames]
+        self._frame_textures = textures
+        self._frame_tex_coords = [texture.tex_coords for texture in textures]
+        self.is_uniform = all(
+            texture.id == textures[0].id and texture.width == textures[0].width and texture.height == textures[0].height
+            for texture in textures
+        )
+
+    def __len__(self) -> int:
+        return len(self.sprites)
+
+    @property
+    def current_image(self) -> AbstractImage:
+        return self.frames[self.frame_idx].image
+
+    def add_sprite(self, sprite: Sprite):
+        if sprite.image is not self.current_image:
+            sprite.image = self.current_image
+        self.sprites.add(sprite)
+        self.start()
+
+    def remove_sprite(self, sprite: Sprite):
+        self.sprites.discard(sprite)
+        if len(self.sprites) == 0:
+            self.stop()
+
+    def start(self):
+        if not self._running and len(self.frames) > 1 and self.frames[self.frame_idx].duration is not None:
+            pyglet.clock.schedule_once(self._advance, self.frames[self.frame_idx].duration)
+            self._running = True
+
+    def stop(self):
+        if self._running:
+            pyglet.clock.unschedule(self._advance)
+            self._running = False
+
+    def _advance(self, dt: float):
+        self._running = False
+        self.frame_idx += 1
+        if self.frame_idx >= len(self.frames):
+            if not self.loop:
+                self.frame_idx = len(self.frames) - 1
+                return
+            self.frame_idx = 0
+        self._apply_frame()
+        if len(self.sprites) > 0:
+            self.start()
+
+    def _apply_frame(self):
+        if self.is_uniform:
+            # All sprites that share a batch share a vertex domain, so these writes only mark the
+            # tex_coord buffer dirty and it is uploaded once when the batch is drawn.
+            texture = self._frame_textures[self.frame_idx]
+            tex_coords = self._frame_tex_coords[self.frame_idx]
+            for sprite in list(self.sprites):
+                if sprite._vertex_list is None:
+                    self.sprites.discard(sprite)
+                    continue
+                sprite._texture = texture
+                sprite._vertex_list.tex_coords[:] = tex_coords
+        else:
+            image = self.current_image
+            for sprite in list(self.sprites):
+                if sprite._vertex_list is None:
+                    self.sprites.discard(sprite)
+                    continue
+                sprite.image = image
+
+class SharedAnimationClock:
+    def __init__(self):
+        # Keyed by the animation itself, so a group goes away with its animation and an id() can't be reused.
+        self._groups = cast(Dict[ResourceAnimation, AnimationGroup], WeakKeyDictionary())
+
+    def get_group(self, res_anim: ResourceAnimation) -> AnimationGroup:
+        if res_anim not in self._groups:
+            self.prune()
+            self._groups[res_anim] = AnimationGroup(res_anim)
+        return self._groups[res_anim]
+
+    def release(self, res_anim: ResourceAnimation):
+        group = self._groups.pop(res_anim, None)
+        if group is not None:
+            group.stop()
+
+    def prune(self):
+        '''Drops the groups that have no sprites left.'''
+        for res_anim, group in list(self._groups.items()):
+            if len(group) == 0:
+                self.release(res_anim)
+
+    @property
+    def groups(self) -> List[AnimationGroup]:
+        return list(self._groups.values())
+
+    @property
+    def num_sprites(self) -> int:
+        return sum([len(group) for group in self._groups.values()])
+
+    def create_sprite(self, res_anim: ResourceAnimation, x: int=0, y: int=0, batch: Batch=None, usage: str='dynamic') -> Sprite:
+        group = self.get_group(res_anim)
+        # The sprite is built from a static frame so that it never schedules its own clock callback.
+        sprite = Sprite(img=group.current_image, x=x, y=y, batch=batch, usage=usage)
+        group.add_sprite(sprite)
+        return sprite
+
+    def register(self, sprite: Sprite, res_anim: ResourceAnimation):
+        self.get_group(res_anim).add_sprite(sprite)
+
+    def unregister(self, sprite: Sprite):
+        for group in list(self._groups.values()):
+            group.remove_sprite(sprite)
+        self.prune()
+
+    def stop_all(self):
+        for group in list(self._groups.values()):
+            group.stop()
+
+default_animation_clock = SharedAnimationClock()
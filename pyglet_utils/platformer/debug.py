@@ -0,0 +1,103 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple, cast
+
+from ..lib.shapes import RectangleBatch, RectangleHandle
+from ..lib.draw_stats import draw_stats
+
+class DebugOverlay:
+    def __init__(self, usage: str='dynamic'):
+        # Visuals are grouped into named layers (e.g. 'contacts', 'player', 'renderbox').
+        # Each layer gets its own batch when its first visual is added, and frees it when the last one is removed.
+        self.usage = usage
+        self._rect_batches = cast(Dict[str, RectangleBatch], {})
+        self._rects = cast(Dict[Tuple[str, Any], RectangleHandle], {})
+        self._layers = set()
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def get_rect_batch(self, layer: str) -> RectangleBatch:
+        if layer not in self._rect_batches:
+            self._rect_batches[layer] = RectangleBatch(usage=self.usage)
+        return self._rect_batches[layer]
+
+    @property
+    def is_allocated(self) -> bool:
+        return len(self._rect_batches) > 0
+
+    def _release_if_empty(self, layer: str):
+        if layer in self._rect_batches and len(self._rect_batches[layer]) == 0:
+            del self._rect_batches[layer]
+
+    def is_enabled(self, layer: str) -> bool:
+        return layer in self._layers
+
+    def enable_layer(self, layer: str):
+        self._layers.add(layer)
+
+    def disable_layer(self, layer: str):
+        self._layers.discard(layer)
+        for rect_key in [rect_key for rect_key in self._rects.keys() if rect_key[0] == layer]:
+            self._rects.pop(rect_key).delete()
+        self._release_if_empty(layer)
+
+    def set_layer_enabled(self, layer: str, enabled: bool):
+        if enabled:
+            self.enable_layer(layer)
+        else:
+            self.disable_layer(layer)
+
+    def toggle_layer(self, layer: str):
+        self.set_layer_enabled(layer, not self.is_enabled(layer))
+
+    def set_rect(
+        self, layer: str, key: Any, x: int, y: int, width: int, height: int,
+        color: Tuple[int]=(255,0,0), transparency: int=255
+    ) -> RectangleHandle:
+        if layer not in self._layers:
+            return None
+        rect_key = (layer, key)
+        rect = self._rects.get(rect_key, None)
+        if rect is None:
+            rect = self.get_rect_batch(layer).add(
+                x=x, y=y, width=width, height=height,
+                color=color, transparency=transparency
+            )
+            self._rects[rect_key] = rect
+        elif not rect.visible:
+            rect.x, rect.y, rect.width, rect.height = x, y, width, height
+            rect.visible = True
+        elif (rect.x, rect.y, rect.width, rect.height) != (x, y, width, height):
+            rect.x, rect.y, rect.width, rect.height = x, y, width, height
+            rect.update_vertices()
+        if (tuple(rect.color), rect.transparency) != (tuple(color), transparency):
+            rect.change_color(color, transparency)
+        return rect
+
+    def hide(self, layer: str, key: Any):
+        # Hidden rectangles keep their slot so that visuals toggled every tick don't reallocate.
+        rect = self._rects.get((layer, key), None)
+        if rect is not None:
+            rect.visible = False
+
+    def remove(self, layer: str, key: Any):
+        rect = self._rects.pop((layer, key), None)
+        if rect is not None:
+            rect.delete()
+            self._release_if_empty(layer)
+
+    def clear(self):
+        for layer in list(self._layers):
+            self.disable_layer(layer)
+
+    def draw(self, layers: List[str]=None):
+        '''Draws every layer, or only the given ones.'''
+        rect_batches = [
+            rect_batch for layer, rect_batch in self._rect_batches.items() if layers is None or layer in layers
+        ]
+        if len(rect_batches) > 0:
+            with draw_stats.section('debug'):
+                for rect_batch in rect_batches:
+                    rect_batch.draw()
+
+default_debug_overlay = DebugOverlay()
@@ -5,6 +5,7 @@ from pyglet.sprite import Sprite
 from pyglet.graphics import Batch
 from pyglet.image import AbstractImage, Animation
 from .resources import ResourceImage, ResourceAnimation
+from .animation import SharedAnimationClock, default_animation_clock
 from .frame import Frame
 from .grid import Grid
 from .render import RenderBox
@@ -19,7 +20,8 @@ class GameObject:
     def __init__(
         self, x: int, y: int, res, frame: Frame, grid: Grid, renderbox: RenderBox, name: str,
         batch: Batch=None, usage: str='dynamic',
-        is_anchor_x_centered: bool=False, parent_name: str=None
+        is_anchor_x_centered: bool=False, parent_name: str=None,
+        animation_clock: SharedAnimationClock=default_animation_clock
     ):
         self._frame = frame
         self._grid = grid
@@ -27,8 +29,10 @@ class GameObject:
         self._x, self._y = x, y
         if isinstance(res, ResourceImage):
             self._sprite = Sprite(img=res.img, x=self.camera_x, y=self.camera_y, batch=batch, usage=usage)
+            if res.is_pending:
+                res.add_load_callback(self._on_res_loaded)
         elif isinstance(res, ResourceAnimation):
-            self._sprite = Sprite(img=res.animation, x=self.camera_x, y=self.camera_y, batch=batch, usage=usage)
+            self._sprite = animation_clock.create_sprite(res, x=self.camera_x, y=self.camera_y, batch=batch, usage=usage)
         else:
             logger.error(f'res must be an instance of ResourceImage or ResourceAnimation')
             logger.error(f'type(res): {type(res)}')
@@ -39,6 +43,12 @@ class GameObject:
         self._batch = batch
         self._is_anchor_x_centered = is_anchor_x_centered
 
+    def _on_res_loaded(self, res: ResourceImage):
+        # The sprite may have been deleted while its image was still loading.
+        if self._sprite._vertex_list is None:
+            return
+        self.sprite.image = res.img
+
     @property
     def frame(self) -> Frame:
         return self._frame
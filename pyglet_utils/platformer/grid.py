@@ -1,16 +1,17 @@
-from ..lib.shapes import LineGrid, Rectangle
+from ..lib.shapes import LineGrid
+from ..lib.draw_stats import draw_stats
+from ..lib.numeric_labels import GlyphAtlas, NumericLabel, NumericLabelBatch
 from ..lib.exception_handler import Error
 from .frame import Frame
+from .debug import DebugOverlay, default_debug_overlay
 from typing import Any, List, Tuple
 from common_utils.base.basic import BasicObject, BasicHandler
 from math import floor, ceil
-from pyglet.text import Label
-from pyglet.graphics import Batch
 
 class GridObject(BasicObject['GridObject']):
     def __init__(
         self, obj: Any, grid_width: int, grid_height: int, tile_width: int, tile_height: int,
-        grid_origin_x: int=0, grid_origin_y: int=0
+        grid_origin_x: int=0, grid_origin_y: int=0, debug_overlay: DebugOverlay=default_debug_overlay
     ):
         super().__init__()
         assert hasattr(obj, 'x')
@@ -33,12 +34,33 @@ class GridObject(BasicObject['GridObject']):
         self._grid_origin_x, self._grid_origin_y = grid_origin_x, grid_origin_y
 
         # Contact Related
-        self.is_in_contact = False
-        self.contact_rectangle = Rectangle(
-            x=self.camera_x, y=self.camera_y, width=self.width, height=self.height,
-            color=(0,255,255), transparency=100
-        )
+        # The contact rectangle only exists in the debug overlay while show_contact is on.
+        self.debug_overlay = debug_overlay
+        self._is_in_contact = False
+        self._show_contact = False
+
+    @property
+    def is_in_contact(self) -> bool:
+        return self._is_in_contact
+
+    @is_in_contact.setter
+    def is_in_contact(self, is_in_contact: bool):
+        if is_in_contact != self._is_in_contact:
+            self._is_in_contact = is_in_contact
+            self.update_contact_rect()
     
+    @property
+    def show_contact(self) -> bool:
+        return self._show_contact
+
+    @show_contact.setter
+    def show_contact(self, show_contact: bool):
+        if show_contact != self._show_contact:
+            self._show_contact = show_contact
+            if show_contact:
+                self.debug_overlay.enable_layer('contacts')
+            self.update_contact_rect()
+
     @property
     def name(self) -> str:
         return self.obj.name
@@ -208,7 +230,19 @@ class GridObject(BasicObject['GridObject']):
         return self.get_occupied_spaces()
     
     def update_contact_rect(self):
-        self.contact_rectangle.move_to(x=self.camera_x, y=self.camera_y)
+        if not self._show_contact:
+            self.delete_contact_rect()
+        elif self._is_in_contact:
+            self.debug_overlay.set_rect(
+                'contacts', id(self),
+                x=self.camera_x, y=self.camera_y, width=self.width, height=self.height,
+                color=(0,255,255), transparency=100
+            )
+        else:
+            self.debug_overlay.hide('contacts', id(self))
+
+    def delete_contact_rect(self):
+        self.debug_overlay.remove('contacts', id(self))
 
 class GridObjectList(BasicHandler['GridObjectList', 'GridObject']):
     def __init__(
@@ -265,9 +299,11 @@ class GridObjectList(BasicHandler['GridObjectList', 'GridObject']):
         return self.get_occupied_spaces()
     
     def draw_contacts(self):
+        debug_overlays = {}
         for grid_obj in self:
-            if grid_obj.is_in_contact:
-                grid_obj.contact_rectangle.draw()
+            debug_overlays[id(grid_obj.debug_overlay)] = grid_obj.debug_overlay
+        for debug_overlay in debug_overlays.values():
+            debug_overlay.draw(layers=['contacts'])
 
 class Grid:
     def __init__(
@@ -275,7 +311,8 @@ class Grid:
         contained_obj_list: GridObjectList=None,
         grid_origin_x: int=0, grid_origin_y: int=0,
         default_grid_visible: bool=False, default_coord_labels_visible: bool=False,
-        coord_label_font_size: int=12, coord_label_color: Tuple[int]=(255,255,255), coord_label_opacity: int=255
+        coord_label_font_size: int=12, coord_label_color: Tuple[int]=(255,255,255), coord_label_opacity: int=255,
+        debug_overlay: DebugOverlay=default_debug_overlay
     ):
         if grid_width % tile_width != 0:
             raise Exception(f'grid_width % tile_width == {grid_width % tile_width} != 0')
@@ -310,7 +347,8 @@ class Grid:
         self.coord_labels_visible = default_coord_labels_visible
 
         # Contact Related
-        self.show_contacts = False
+        self.debug_overlay = debug_overlay
+        self._show_contacts = False
 
     @property
     def grid_width(self) -> int:
@@ -343,56 +381,53 @@ class Grid:
     def move(self, dx: int=0, dy: int=0):
         if dx != 0 or dy != 0:
             # Move Line Grid
-            hor_vertex_list, vert_vertex_list = self.__line_grid._vertex_list_grid
-            for hor_vertex in hor_vertex_list:
-                hor_vertex.vertices[1] = (hor_vertex.vertices[1] + dy) % self.frame.height
-                hor_vertex.vertices[3] = (hor_vertex.vertices[3] + dy) % self.frame.height
-            for vert_vertex in vert_vertex_list:
-                vert_vertex.vertices[0] = (vert_vertex.vertices[0] + dx) % self.frame.width
-                vert_vertex.vertices[2] = (vert_vertex.vertices[2] + dx) % self.frame.width
+            self.__line_grid.scroll(dx=dx, dy=dy)
             
             # Move Coordinate Labels
             for coord_label in self.coord_labels:
-                coord_label.x += dx
-                coord_label.y += dy
-                needs_new_label = False
-                if coord_label.x >= self.frame.width or coord_label.x < 0:
-                    needs_new_label = True
-                    coord_label.x = coord_label.x % self.frame.width
-                if coord_label.y >= self.frame.height or coord_label.y < 0:
-                    needs_new_label = True
-                    coord_label.y = coord_label.y % self.frame.height
-                if needs_new_label:
-                    label_world_x = coord_label.x + self.frame.x
-                    label_world_y = coord_label.y + self.frame.y
+                new_x = coord_label.x + dx
+                new_y = coord_label.y + dy
+                needs_new_text = False
+                if new_x >= self.frame.width or new_x < 0:
+                    needs_new_text = True
+                    new_x = new_x % self.frame.width
+                if new_y >= self.frame.height or new_y < 0:
+                    needs_new_text = True
+                    new_y = new_y % self.frame.height
+                new_text = None
+                if needs_new_text:
+                    label_world_x = new_x + self.frame.x
+                    label_world_y = new_y + self.frame.y
                     new_x_coord = int((label_world_x - self.grid_origin_x) // self.tile_width)
                     new_y_coord = int((label_world_y - self.grid_origin_y) // self.tile_height)
-                    coord_label.text = f'({new_x_coord}, {new_y_coord})'
+                    new_text = f'({new_x_coord}, {new_y_coord})'
+                coord_label.update(x=new_x, y=new_y, text=new_text)
 
             # Move Contact Rectangles
-            for grid_obj in self.contained_obj_list:
-                grid_obj.update_contact_rect()
+            if self.show_contacts:
+                for grid_obj in self.contained_obj_list:
+                    grid_obj.update_contact_rect()
 
     def toggle_grid_visible(self):
         self.grid_visible = not self.grid_visible
 
-    def _build_coord_labels(self, font_size: int=12, color: Tuple[int]=(255, 255, 255), opacity: int=255) -> (List[Label], Batch):
+    def _build_coord_labels(self, font_size: int=12, color: Tuple[int]=(255, 255, 255), opacity: int=255) -> (List[NumericLabel], NumericLabelBatch):
+        # All coordinate labels share one glyph atlas texture and one vertex buffer, so they are drawn in a single call.
+        atlas = GlyphAtlas(font_name='Times New Roman', font_size=font_size)
         coord_labels = []
-        coord_labels_batch = Batch()
+        coord_labels_batch = NumericLabelBatch(
+            atlas=atlas, max_chars=16, color=tuple(list(color)+[opacity])
+        )
         n_rows = self.grid_height // self.tile_height
         n_cols = self.grid_width // self.tile_width
         for grid_y in range(n_rows):
             y_center = int((grid_y + 0.5) * self.tile_height)
             for grid_x in range(n_cols):
                 x_center = int((grid_x + 0.5) * self.tile_width)
-                coord_label = Label(
+                coord_label = coord_labels_batch.add(
                     text=f'({grid_x-self.grid_origin_x//self.tile_width}, {grid_y-self.grid_origin_y//self.tile_height})',
-                    font_name='Times New Roman',
-                    font_size=font_size,
                     x=x_center, y=y_center,
-                    anchor_x='center', anchor_y='center',
-                    color=tuple(list(color)+[opacity]),
-                    batch=coord_labels_batch
+                    anchor_x='center', anchor_y='center'
                 )
                 coord_labels.append(coord_label)
         return coord_labels, coord_labels_batch
@@ -401,12 +436,11 @@ class Grid:
         self.coord_labels_visible = not self.coord_labels_visible
 
     def draw(self):
-        if self.grid_visible:
-            self.__line_grid.draw()
-            if self.coord_labels_visible:
-                self.coord_labels_batch.draw()
-        if self.show_contacts:
-            self.contained_obj_list.draw_contacts()
+        with draw_stats.section('grid'):
+            if self.grid_visible:
+                self.__line_grid.draw()
+                if self.coord_labels_visible:
+                    self.coord_labels_batch.draw()
     
     def get_coords_str(self, obj_name: str) -> str:
         grid_obj = self.contained_obj_list.get_obj_from_name(obj_name)
@@ -425,8 +459,10 @@ class Grid:
             obj=obj,
             grid_width=self.grid_width, grid_height=self.grid_height,
             tile_width=self.tile_width, tile_height=self.tile_height,
-            grid_origin_x=self.grid_origin_x, grid_origin_y=self.grid_origin_y
+            grid_origin_x=self.grid_origin_x, grid_origin_y=self.grid_origin_y,
+            debug_overlay=self.debug_overlay
         )
+        grid_obj.show_contact = self._show_contacts
         self.contained_obj_list.append(grid_obj)
     
     def remove_obj(self, name: str):
@@ -434,6 +470,7 @@ class Grid:
         for i in list(range(len(self.contained_obj_list)))[::-1]:
             if self.contained_obj_list[i].name == name or self.contained_obj_list[i].parent_name == name:
                 found = True
+                self.contained_obj_list[i].delete_contact_rect()
                 del self.contained_obj_list[i]
                 break
         if not found:
@@ -444,6 +481,17 @@ class Grid:
                 """
             )
 
+    @property
+    def show_contacts(self) -> bool:
+        return self._show_contacts
+
+    @show_contacts.setter
+    def show_contacts(self, show_contacts: bool):
+        # Only this grid's objects are affected. Other grids on the same overlay keep their own setting.
+        self._show_contacts = show_contacts
+        for grid_obj in self.contained_obj_list:
+            grid_obj.show_contact = show_contacts
+
     def toggle_show_contacts(self):
         self.show_contacts = not self.show_contacts
     
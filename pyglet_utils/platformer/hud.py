@@ -0,0 +1,188 @@
+from __future__ import annotations
+from typing import List, Dict, Tuple, cast
+import pyglet.gl as gl
+from pyglet.graphics import Batch, Group
+from pyglet.image import AbstractImage, TextureRegion
+from pyglet.image.atlas import TextureAtlas
+
+from ..lib.shapes import TextureAtlasGroup, write_vertex_region
+from ..lib.draw_stats import draw_stats
+from ..lib.exception_handler import Error
+from .resources import ResourceImage, HUDImages
+
+DIGIT_NAMES = [f'hud_{digit}' for digit in range(10)]
+DEFAULT_ICON_NAMES = [
+    'hud_x', 'hud_coins',
+    'hud_heartEmpty', 'hud_heartFull', 'hud_heartHalf',
+    'hud_gem_blue', 'hud_gem_green', 'hud_gem_red', 'hud_gem_yellow',
+    'hud_keyBlue', 'hud_keyGreen', 'hud_keyRed', 'hud_keyYellow',
+    'hud_p1', 'hud_p2', 'hud_p3'
+]
+
+class HUDAtlas:
+    def __init__(self, res_images: Dict[str, ResourceImage], atlas_size: int=512):
+        images = cast(Dict[str, AbstractImage], {name: res_img.img for name, res_img in res_images.items()})
+        textures = [img.get_texture() for img in images.values()]
+        if len(set([texture.id for texture in textures])) == 1:
+            # Already packed together (e.g. through an asset manifest), so the regions can be used as they are.
+            self.regions = cast(Dict[str, TextureRegion], {name: img.get_texture() for name, img in images.items()})
+            self.texture = textures[0].owner if isinstance(textures[0], TextureRegion) else textures[0]
+        else:
+            atlas = TextureAtlas(width=atlas_size, height=atlas_size)
+            self.regions = {name: atlas.add(img.get_image_data()) for name, img in images.items()}
+            self.texture = atlas.texture
+
+    @classmethod
+    def from_hud_images(cls, icon_names: List[str]=None, atlas_size: int=512) -> HUDAtlas:
+        icon_names = icon_names if icon_names is not None else DEFAULT_ICON_NAMES
+        return HUDAtlas(
+            res_images={name: getattr(HUDImages, name) for name in DIGIT_NAMES + icon_names},
+            atlas_size=atlas_size
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.regions
+
+    def __getitem__(self, name: str) -> TextureRegion:
+        if name not in self.regions:
+            raise Error(f"Couldn't find '{name}' in HUD atlas.")
+        return self.regions[name]
+
+class HUDCounter:
+    def __init__(
+        self, hud: HUD, x: int, y: int, value: int=0, num_digits: int=3,
+        icon: str=None, show_x: bool=True, pad_zeros: bool=False, scale: float=1.0
+    ):
+        self.hud = hud
+        self.num_digits = num_digits
+        self.pad_zeros = pad_zeros
+        self.scale = scale
+        self._x, self._y = x, y
+
+        # Quad slots: [icon], [x], digit_0, ..., digit_(num_digits-1)
+        self.prefix = [name for name in [icon, 'hud_x' if show_x and icon is not None else None] if name is not None]
+        self.num_quads = len(self.prefix) + num_digits
+        digit_regions = [hud.atlas[name] for name in DIGIT_NAMES]
+        # Every digit slot is as wide as the widest digit so that changing one digit never moves the others.
+        self._digit_width = max([region.width for region in digit_regions])
+        self._digits = cast(List[str], [None] * num_digits)
+        self._value = None
+        self.vertex_list = hud.batch.add(
+            4 * self.num_quads,
+            gl.GL_QUADS,
+            hud.group,
+            'v2f/dynamic',
+            't3f/dynamic',
+            ('c4B/static', (255, 255, 255, 255) * (4 * self.num_quads))
+        )
+        for slot_idx, name in enumerate(self.prefix):
+            self._write_slot(slot_idx, name)
+        self.value = value
+
+    @property
+    def max_value(self) -> int:
+        return 10**self.num_digits - 1
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    def move_to(self, x: int=None, y: int=None):
+        self._x = x if x is not None else self._x
+        self._y = y if y is not None else self._y
+        for slot_idx, name in enumerate(self.prefix):
+            self._write_slot(slot_idx, name)
+        for digit_idx, digit in enumerate(self._digits):
+            self._write_slot(len(self.prefix) + digit_idx, DIGIT_NAMES[int(digit)] if digit is not None else None)
+
+    def _get_slot_x(self, slot_idx: int) -> float:
+        x = self._x
+        for name in self.prefix[:slot_idx]:
+            x += self.hud.atlas[name].width * self.scale
+        if slot_idx > len(self.prefix):
+            x += (slot_idx - len(self.prefix)) * self._digit_width * self.scale
+        return x
+
+    def _write_slot(self, slot_idx: int, name: str):
+        if name is None:
+            # Blank slots are collapsed to a degenerate quad.
+            vertices = [0.0] * 8
+            tex_coords = [0.0] * 12
+        else:
+            region = self.hud.atlas[name]
+            x0 = self._get_slot_x(slot_idx)
+            if slot_idx >= len(self.prefix):
+                x0 += (self._digit_width - region.width) * self.scale / 2
+            y0 = self._y
+            x1 = x0 + region.width * self.scale
+            y1 = y0 + region.height * self.scale
+            vertices = [x0, y0, x1, y0, x1, y1, x0, y1]
+            tex_coords = list(region.tex_coords)
+        write_vertex_region(self.vertex_list, 'vertices', start=4*slot_idx, count=4, values=vertices)
+        write_vertex_region(self.vertex_list, 'tex_coords', start=4*slot_idx, count=4, values=tex_coords)
+
+    def _to_digits(self, value: int) -> List[str]:
+        text = str(min(max(int(value), 0), self.max_value))
+        if self.pad_zeros:
+            text = text.rjust(self.num_digits, '0')
+        # Digits are left aligned and unused trailing slots stay blank.
+        return list(text) + [None] * (self.num_digits - len(text))
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @value.setter
+    def value(self, value: int):
+        if value == self._value:
+            return
+        self._value = value
+        for digit_idx, digit in enumerate(self._to_digits(value)):
+            if digit != self._digits[digit_idx]:
+                self._digits[digit_idx] = digit
+                self._write_slot(len(self.prefix) + digit_idx, DIGIT_NAMES[int(digit)] if digit is not None else None)
+
+    def delete(self):
+        self.hud.remove(self)
+
+class HUD:
+    def __init__(self, atlas: HUDAtlas=None, batch: Batch=None, parent_group: Group=None):
+        self.atlas = atlas if atlas is not None else HUDAtlas.from_hud_images()
+        self.batch = batch if batch is not None else Batch()
+        self.group = TextureAtlasGroup(atlas=self.atlas, parent=parent_group)
+        self.counters = cast(List[HUDCounter], [])
+
+    def __len__(self) -> int:
+        return len(self.counters)
+
+    def __iter__(self):
+        return iter(self.counters)
+
+    def add_counter(
+        self, x: int, y: int, value: int=0, num_digits: int=3,
+        icon: str=None, show_x: bool=True, pad_zeros: bool=False, scale: float=1.0
+    ) -> HUDCounter:
+        counter = HUDCounter(
+            hud=self, x=x, y=y, value=value, num_digits=num_digits,
+            icon=icon, show_x=show_x, pad_zeros=pad_zeros, scale=scale
+        )
+        self.counters.append(counter)
+        return counter
+
+    def remove(self, counter: HUDCounter):
+        if counter in self.counters:
+            self.counters.remove(counter)
+            counter.vertex_list.delete()
+
+    def clear(self):
+        for counter in self.counters:
+            counter.vertex_list.delete()
+        self.counters = []
+
+    def draw(self):
+        with draw_stats.section('hud'):
+            self.batch.draw()
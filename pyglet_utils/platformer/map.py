@@ -5,7 +5,7 @@ from pyglet.graphics import Batch
 
 from common_utils.base.basic import MultiParameterHandler
 
-from .resources import ResourceImage, TileImages, ItemImages
+from .resources import ResourceImage, AsyncImageLoader, TileImages, ItemImages
 from .grid import Grid
 from .frame import Frame
 from .platform import Platform
@@ -13,10 +13,12 @@ from .render import RenderBox
 from .mouse import Mouse
 from .game_obj import GameObjectHandler
 from ..lib.shapes import Rectangle
+from ..lib.gl_state import gl_state
+from ..lib.draw_stats import draw_stats
 from ..lib.exception_handler import Error
 
 class BlockSelector:
-    def __init__(self, images_constructor: type):
+    def __init__(self, images_constructor: type, loader: AsyncImageLoader=None):
         assert type(images_constructor) is type
         self.images_constructor = images_constructor
         self.keys = [key for key, val in self.images_constructor.__dict__.items() if type(val) is ResourceImage]
@@ -29,6 +31,11 @@ class BlockSelector:
             )
         self.current_idx = 0 if len(self.keys) > 0 else None
         self.current_res_img = self._get_current_res_img()
+        if loader is not None:
+            self.preload(loader)
+
+    def preload(self, loader: AsyncImageLoader):
+        loader.request_all(self.images_constructor)
     
     def _get_current_res_img(self) -> TextureRegion:
         return self.images_constructor.__dict__[self.keys[self.current_idx]]
@@ -64,7 +71,7 @@ class BlockSelectorHandler(MultiParameterHandler['BlockSelectorHandler', 'BlockS
 class MapMaker:
     def __init__(
         self, frame: Frame, grid: Grid, renderbox: RenderBox, mouse: Mouse, game_obj_handler: GameObjectHandler,
-        platform_list: List[Platform]=None, block_queue: Platform=None
+        platform_list: List[Platform]=None, block_queue: Platform=None, loader: AsyncImageLoader=None
     ):
         self.frame = frame
         self.grid = grid
@@ -81,8 +88,8 @@ class MapMaker:
         # Block Preview Related
         self.block_selector_handler = BlockSelectorHandler(
             [
-                BlockSelector(TileImages),
-                BlockSelector(ItemImages)
+                BlockSelector(TileImages, loader=loader),
+                BlockSelector(ItemImages, loader=loader)
             ]
         )
         self.block_preview_rect_color = (100,255,20)
@@ -133,10 +140,16 @@ class MapMaker:
                     img=self.block_selector_handler.res_img.img, x=rect_x, y=rect_y
                 )
                 self.block_preview_sprite.opacity = self.block_preview_sprite_opacity
+                if self.block_selector_handler.res_img.is_pending:
+                    self.block_selector_handler.res_img.add_load_callback(self._on_preview_res_loaded)
             else:
                 self.block_preview_rect.move_to(x=rect_x, y=rect_y)
                 self.block_preview_sprite.position = (rect_x, rect_y)
 
+    def _on_preview_res_loaded(self, res_img: ResourceImage):
+        if self.block_preview_sprite is not None and self.block_selector_handler.res_img is res_img:
+            self.block_preview_sprite.image = res_img.img
+
     def reset_block_preview(self):
         self.block_preview_rect = None
         self.block_preview_sprite = None
@@ -153,5 +166,7 @@ class MapMaker:
 
     def draw_block_preview(self):
         if self.block_preview_sprite is not None:
-            self.block_preview_rect.draw()
-            self.block_preview_sprite.draw()
\ No newline at end of file
+            with draw_stats.section('map_preview'):
+                self.block_preview_rect.draw()
+                self.block_preview_sprite.draw()
+            gl_state.invalidate()
\ No newline at end of file
@@ -5,9 +5,9 @@ from .game_obj import GameObject
 from .frame import Frame
 from .render import RenderBox
 from .grid import Grid, GridObject
+from .debug import DebugOverlay, default_debug_overlay
 from ..lib.exception_handler import Error
 from pyglet.graphics import Batch
-from pyglet.shapes import Circle, Rectangle
 
 from common_utils.check_utils import check_value
 
@@ -34,8 +34,32 @@ class ArrowKeyBuffer:
     def is_released(self) -> bool:
         return len(self.buffer) == 0
 
+class PlayerSpriteTable:
+    def __init__(self, player_res_list: list):
+        # Maps (player_idx, status, facing) to the image or animation that should be shown in that state.
+        self.table = {}
+        for player_idx, player_res in enumerate(player_res_list):
+            self.table[(player_idx, 'idle', 'right')] = player_res.idle_right.img
+            self.table[(player_idx, 'idle', 'left')] = player_res.idle_left.img
+            self.table[(player_idx, 'jumping', 'right')] = player_res.jump_right.img
+            self.table[(player_idx, 'jumping', 'left')] = player_res.jump_left.img
+            self.table[(player_idx, 'walking', 'right')] = player_res.walk_right_anim.animation
+            self.table[(player_idx, 'walking', 'left')] = player_res.walk_left_anim.animation
+
+    def get(self, player_idx: int, status: str, facing: str):
+        state = (player_idx, status, facing)
+        if state not in self.table:
+            raise Error(f'Invalid player sprite state: {state}')
+        return self.table[state]
+
 class Player(GameObject):
-    def __init__(self, x: int, y: int, frame: Frame, grid: Grid, renderbox: RenderBox, name: str='Player1', batch: Batch=None, debug: bool=False):
+    def __init__(
+        self, x: int, y: int, frame: Frame, grid: Grid, renderbox: RenderBox, name: str='Player1', batch: Batch=None, debug: bool=False,
+        debug_overlay: DebugOverlay=default_debug_overlay
+    ):
+        self.debug_overlay = debug_overlay
+        self._debug = False
+
         # Player Sprite Select Related
         self.player_res_list = [PlayerImages.p1, PlayerImages.p2, PlayerImages.p3]
         self.player_select = 0
@@ -57,6 +81,10 @@ class Player(GameObject):
         self.status = 'jumping'
         self.arrow_key_buffer = ArrowKeyBuffer()
 
+        # Sprite State Related
+        self.sprite_table = PlayerSpriteTable(self.player_res_list)
+        self._sprite_state = (self.player_select, self.status, self.facing)
+
         # Grid Related
         self.up_contact_obj_list = cast(List[GridObject], [])
         self.down_contact_obj_list = cast(List[GridObject], [])
@@ -64,10 +92,37 @@ class Player(GameObject):
         self.right_contact_obj_list = cast(List[GridObject], [])
 
         # Debug
-        self.debug = debug
-        self.ref_point = Circle(x=self.camera_x, y=self.camera_y, radius=5, color=(255,0,0))
-        self.ref_rect = Rectangle(x=self.camera_x, y=self.camera_y, width=self.width, height=self.height, color=(0,0,255))
-        self.ref_rect.anchor_x = self.ref_rect.width // 2
+        if debug:
+            self.debug = True
+
+    @property
+    def debug(self) -> bool:
+        return self._debug
+
+    @debug.setter
+    def debug(self, debug: bool):
+        self._debug = debug
+        if debug:
+            self.debug_overlay.enable_layer('player')
+            self.update_debug()
+        else:
+            self.debug_overlay.remove('player', (self.name, 'ref_rect'))
+            self.debug_overlay.remove('player', (self.name, 'ref_point'))
+
+    def update_debug(self):
+        if not self.debug:
+            return
+        self.debug_overlay.set_rect(
+            'player', (self.name, 'ref_rect'),
+            x=self.camera_x - self.sprite.width // 2, y=self.camera_y,
+            width=self.sprite.width, height=self.sprite.height,
+            color=(0,0,255), transparency=100
+        )
+        self.debug_overlay.set_rect(
+            'player', (self.name, 'ref_point'),
+            x=self.camera_x - 5, y=self.camera_y - 5, width=10, height=10,
+            color=(255,0,0)
+        )
 
     @property
     def x(self) -> int:
@@ -76,9 +131,7 @@ class Player(GameObject):
     @x.setter
     def x(self, x: int):
         super().x = x
-        if self.debug:
-            self.ref_point.x = self.camera_x
-            self.ref_rect.x = self.camera_x
+        self.update_debug()
 
     @property
     def y(self) -> int:
@@ -87,9 +140,7 @@ class Player(GameObject):
     @y.setter
     def y(self, y: int):
         super().y = y
-        if self.debug:
-            self.ref_point.y = self.camera_y
-            self.ref_rect.y = self.camera_y
+        self.update_debug()
 
     def change_player(self, idx: int):
         self.player_res = self.player_res_list[idx]
@@ -105,35 +156,14 @@ class Player(GameObject):
 
     def change_sprite(self, image):
         self.sprite.image = image
-        if self.debug:
-            self.ref_rect.width = self.sprite.width
-            self.ref_rect.height = self.sprite.height
-            self.ref_rect.anchor_x = self.ref_rect.width // 2
-
-    def update_sprite(self):
-        if self.status == 'idle':
-            if self.facing == 'right':
-                self.change_sprite(self.player_res.idle_right.img)
-            elif self.facing == 'left':
-                self.change_sprite(self.player_res.idle_left.img)
-            else:
-                raise Exception
-        elif self.status == 'jumping':
-            if self.facing == 'right':
-                self.change_sprite(self.player_res.jump_right.img)
-            elif self.facing == 'left':
-                self.change_sprite(self.player_res.jump_left.img)
-            else:
-                raise Exception
-        elif self.status == 'walking':
-            if self.facing == 'right':
-                self.change_sprite(self.player_res.walk_right_anim.animation)
-            elif self.facing == 'left':
-                self.change_sprite(self.player_res.walk_left_anim.animation)
-            else:
-                raise Exception
-        else:
-            raise Exception
+        self.update_debug()
+
+    def update_sprite(self, force: bool=False):
+        state = (self.player_select, self.status, self.facing)
+        if state == self._sprite_state and not force:
+            return
+        self.change_sprite(self.sprite_table.get(*state))
+        self._sprite_state = state
 
     @property
     def is_idle(self) -> bool:
@@ -190,12 +220,6 @@ class Player(GameObject):
         self.vy = 0
         self.update_sprite()
 
-    def draw(self):
-        if self.debug:
-            self.ref_point.draw()
-            self.ref_rect.draw()
-        super().draw()
-
     def move(self, dx: int, dy: int):
         player_grid_obj = self.grid.contained_obj_list.get_obj_from_name(self.name)
         other_renderable_objects = self.renderbox.get_all_renderable_objects(exclude_names=[self.name])
@@ -1,6 +1,8 @@
 from typing import List, Any, Tuple
 from .frame import Frame
-from ..lib.shapes import Rectangle
+from .debug import DebugOverlay, default_debug_overlay
+from ..lib.gl_state import gl_state
+from ..lib.draw_stats import draw_stats
 from ..lib.exception_handler import Error
 from pyglet.graphics import Batch
 
@@ -98,10 +100,13 @@ class RenderObject:
 
     def draw(self):
         self.obj.update_sprite_position()
-        if self.is_batch:
-            self.batch.draw()
-        else:
-            self.obj.draw()
+        with draw_stats.section('render'):
+            if self.is_batch:
+                self.batch.draw()
+            else:
+                self.obj.draw()
+        # Sprite groups set and unset blend/texture state themselves.
+        gl_state.invalidate()
 
 class BoundingBox:
     def __init__(self, xmin: int, ymin: int, xmax: int, ymax: int):
@@ -124,20 +129,20 @@ class BoundingBox:
 class RenderBox:
     def __init__(
         self, frame: Frame, render_distance_proportion: float=1.2, render_objs: List[RenderObject]=None,
-        debug: bool=False, debug_color: Tuple[int]=(0, 255, 0), debug_transparency: int=50
+        debug: bool=False, debug_color: Tuple[int]=(0, 255, 0), debug_transparency: int=50,
+        debug_overlay: DebugOverlay=default_debug_overlay
     ):
         self.frame = frame
         self._render_distance_proportion = render_distance_proportion
         self.render_objs = render_objs if render_objs is not None else []
         
         # Debug Related
-        self.debug = debug
-        self.debug_rect = Rectangle(
-            x=self.x, y=self.y,
-            width=self.width, height=self.height,
-            color=debug_color, transparency=debug_transparency,
-            usage='dynamic'
-        )
+        self.debug_overlay = debug_overlay
+        self.debug_color = debug_color
+        self.debug_transparency = debug_transparency
+        self._debug = False
+        if debug:
+            self.debug = True
 
     @property
     def render_distance_proportion(self) -> float:
@@ -250,11 +255,29 @@ class RenderBox:
                 result.append(obj)
         return result
     
+    @property
+    def debug(self) -> bool:
+        return self._debug
+
+    @debug.setter
+    def debug(self, debug: bool):
+        # Only this box's rectangle is added or removed. Other boxes on the same overlay keep their own setting.
+        self._debug = debug
+        if debug:
+            self.debug_overlay.enable_layer('renderbox')
+            self.update_debug()
+        else:
+            self.debug_overlay.remove('renderbox', id(self))
+
     def update_debug(self):
-        self.debug_rect.x = self.x
-        self.debug_rect.y = self.y
-        self.debug_rect.width = self.width
-        self.debug_rect.height = self.height
+        if not self.debug:
+            return
+        self.debug_overlay.set_rect(
+            'renderbox', id(self),
+            x=self.x - self.frame.x, y=self.y - self.frame.y,
+            width=self.width, height=self.height,
+            color=self.debug_color, transparency=self.debug_transparency
+        )
 
     def toggle_debug(self):
         self.debug = not self.debug
@@ -263,6 +286,4 @@ class RenderBox:
         objs = self.get_all_renderable_objects(exclude_names=exclude_names, fully_contained_only=fully_contained_only)
         for obj in objs:
             obj.draw()
-        
-        if self.debug:
-            self.debug_rect.draw()
\ No newline at end of file
+        self.update_debug()
\ No newline at end of file
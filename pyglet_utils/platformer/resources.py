@@ -1,23 +1,242 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Tuple, Callable
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
+import os
+import time
 import pyglet
-from pyglet.image import Animation
+from pyglet.image import Animation, AbstractImage, ImageData, SolidColorImagePattern
+from pyglet.image.atlas import TextureBin
 
+from logger import logger
+from ..lib.asset_pipeline import AssetManifest, MANIFEST_ENV_VAR
+
+# The loose files are indexed by pyglet.resource on first use, which never happens when the manifest covers them.
 pyglet.resource.path = ["/home/clayton/Pictures/sprites/platformer"]
-pyglet.resource.reindex()
+
+_manifest = None
+
+def use_manifest(manifest: AssetManifest):
+    # Resolve ResourceImage paths from prebuilt atlases instead of decoding loose files.
+    # The image classes below are built at import, so they only pick this up through MANIFEST_ENV_VAR.
+    global _manifest
+    _manifest = manifest
+
+def load_manifest(path: str) -> AssetManifest:
+    manifest = AssetManifest.load(path)
+    use_manifest(manifest)
+    return manifest
+
+if os.environ.get(MANIFEST_ENV_VAR):
+    load_manifest(os.environ[MANIFEST_ENV_VAR])
+
+class AsyncImageLoader:
+    def __init__(
+        self, max_workers: int=2, max_uploads_per_tick: int=8, upload_time_budget: float=0.004,
+        placeholder_size: Tuple[int]=(70, 70), placeholder_color: Tuple[int]=(255, 0, 255, 100),
+        atlas_size: int=512
+    ):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._decoded_queue = Queue()
+        self.max_uploads_per_tick = max_uploads_per_tick
+        self.upload_time_budget = upload_time_budget
+        self.placeholder_size = placeholder_size
+        self.placeholder_color = placeholder_color
+        self.atlas_size = atlas_size
+        self._texture_bin = TextureBin(texture_width=atlas_size, texture_height=atlas_size)
+        self._placeholder = None
+        self._pending = {}
+        self._cached_images = {}
+        self.num_requested = 0
+        self.num_loaded = 0
+        self.num_failed = 0
+        self.progress_callbacks = []
+        self._scheduled = False
+
+    @property
+    def placeholder(self) -> AbstractImage:
+        # Texture creation has to happen on the main (GL) thread, so the placeholder is built on first use.
+        if self._placeholder is None:
+            width, height = self.placeholder_size
+            self._placeholder = SolidColorImagePattern(self.placeholder_color).create_image(width, height).get_texture()
+        return self._placeholder
+
+    @property
+    def num_finished(self) -> int:
+        return self.num_loaded + self.num_failed
+
+    @property
+    def num_pending(self) -> int:
+        return self.num_requested - self.num_finished
+
+    @property
+    def progress(self) -> float:
+        return self.num_finished / self.num_requested if self.num_requested > 0 else 1.0
+
+    @property
+    def is_done(self) -> bool:
+        return self.num_pending == 0
+
+    def add_progress_callback(self, callback: Callable[[int, int, int], None]):
+        # Called with (num_loaded, num_failed, num_requested) whenever a request finishes.
+        self.progress_callbacks.append(callback)
+
+    @staticmethod
+    def _decode(path: str) -> ImageData:
+        # Runs on a worker thread. Only CPU-side decoding is done here.
+        with pyglet.resource.file(path) as f:
+            return pyglet.image.load(path, file=f).get_image_data()
+
+    def request(self, res_img: ResourceImage):
+        if _manifest is not None and res_img.path in _manifest:
+            res_img._set_loaded_img(_manifest.get_image(res_img.path))
+            return
+        if res_img.path in self._cached_images:
+            res_img._set_loaded_img(self._cached_images[res_img.path])
+            return
+        if res_img.path in self._pending:
+            self._pending[res_img.path].append(res_img)
+            return
+        self._pending[res_img.path] = [res_img]
+        self.num_requested += 1
+        future = self._executor.submit(self._decode, res_img.path)
+        future.add_done_callback(lambda future, path=res_img.path: self._decoded_queue.put((path, future)))
+
+    def request_all(self, images_constructor: type):
+        for val in images_constructor.__dict__.values():
+            if type(val) is ResourceImage and not val.is_loaded:
+                val.load_async(loader=self)
+
+    def _upload(self, image_data: ImageData) -> AbstractImage:
+        if image_data.width <= self.atlas_size and image_data.height <= self.atlas_size:
+            return self._texture_bin.add(image_data)
+        else:
+            return image_data.get_texture()
+
+    def update(self, dt: float=None):
+        start_time = time.perf_counter()
+        n_uploads = 0
+        while n_uploads < self.max_uploads_per_tick and time.perf_counter() - start_time < self.upload_time_budget:
+            try:
+                path, future = self._decoded_queue.get_nowait()
+            except Empty:
+                break
+            try:
+                img = self._upload(future.result())
+            except Exception as e:
+                # A missing or corrupt file still finishes its request. The images stay unloaded with the
+                # placeholder standing in, so a later load_async tries again.
+                logger.error(f"Failed to load '{path}': {e}")
+                for res_img in self._pending.pop(path):
+                    res_img._set_failed(self.placeholder)
+                self.num_failed += 1
+            else:
+                self._cached_images[path] = img
+                for res_img in self._pending.pop(path):
+                    res_img._set_loaded_img(img)
+                self.num_loaded += 1
+            n_uploads += 1
+            for callback in self.progress_callbacks:
+                callback(self.num_loaded, self.num_failed, self.num_requested)
+
+    def schedule(self, interval: float=1/60):
+        if not self._scheduled:
+            pyglet.clock.schedule_interval(self.update, interval)
+            self._scheduled = True
+
+    def unschedule(self):
+        if self._scheduled:
+            pyglet.clock.unschedule(self.update)
+            self._scheduled = False
+
+    def shutdown(self):
+        self.unschedule()
+        self._executor.shutdown(wait=False)
 
 class ResourceImage:
     def __init__(self, path: str):
         self.path = path
-        self.img = pyglet.resource.image(self.path)
+        self._img = None
+        self._loader = None
+        # Shown in place of an image whose async load failed, until a later load succeeds.
+        self._stand_in = None
+        self._load_callbacks = []
+
+    @property
+    def img(self) -> AbstractImage:
+        if self._img is None:
+            if self._loader is not None:
+                return self._loader.placeholder
+            if self._stand_in is not None:
+                return self._stand_in
+            if _manifest is not None and self.path in _manifest:
+                self._img = _manifest.get_image(self.path)
+            else:
+                self._img = pyglet.resource.image(self.path)
+        return self._img
+
+    @img.setter
+    def img(self, img: AbstractImage):
+        self._img = img
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._img is not None
+
+    @property
+    def is_pending(self) -> bool:
+        return self._img is None and self._loader is not None
+
+    def load_async(self, loader: AsyncImageLoader):
+        if self.is_loaded or self.is_pending:
+            return
+        self._loader = loader
+        loader.request(self)
+
+    def add_load_callback(self, callback: Callable[[ResourceImage], None]):
+        if self.is_loaded:
+            callback(self)
+        else:
+            self._load_callbacks.append(callback)
+
+    def _set_failed(self, placeholder: AbstractImage):
+        # Load callbacks stay registered for the retry.
+        self._stand_in = placeholder
+        self._loader = None
+
+    def _set_loaded_img(self, img: AbstractImage):
+        self._img = img
+        self._loader = None
+        self._stand_in = None
+        callbacks, self._load_callbacks = self._load_callbacks, []
+        for callback in callbacks:
+            callback(self)
     
+    def get_flipped_x(self) -> ResourceImage:
+        # Uses the prebuilt flipped atlas region when the manifest has one. The manifest's region is shared,
+        # so the anchor is set on a copy of it.
+        img = self.img
+        if _manifest is not None and self.path in _manifest:
+            flipped_img = _manifest.get_image(self.path, flip_x=True)
+            flipped_img = flipped_img.get_region(0, 0, flipped_img.width, flipped_img.height)
+            flipped_img.anchor_x, flipped_img.anchor_y = img.width - img.anchor_x, img.anchor_y
+        else:
+            flipped_img = img.get_transform(flip_x=True)
+        new_res_img = ResourceImage(path=self.path)
+        new_res_img.img = flipped_img
+        return new_res_img
+
     # def get_transform(self, *args, **kwargs) -> ResourceImage:
     #     self.img = self.img.get_transform(args, kwargs)
     #     return self
     
     def copy(self) -> ResourceImage:
         new_res_img = ResourceImage(path=self.path)
-        new_res_img.img = self.img
+        if self.is_pending:
+            new_res_img._loader = self._loader
+            self.add_load_callback(lambda res_img: new_res_img._set_loaded_img(res_img.img))
+        else:
+            new_res_img.img = self.img
         return new_res_img
 
     def to_dict(self) -> dict:
@@ -206,17 +425,13 @@ class PlayerImages:
         walk_right_seq = [res_img.copy() for res_img in walk_seq]
         for res_img in walk_right_seq:
             res_img.img = res_img.img.get_transform(flip_x=False)
-        walk_left_seq = [res_img.copy() for res_img in walk_seq]
-        for res_img in walk_left_seq:
-            res_img.img = res_img.img.get_transform(flip_x=True)
+        walk_left_seq = [res_img.get_flipped_x() for res_img in walk_seq]
         idle_right = stand.copy()
         idle_right.img = idle_right.img.get_transform(flip_x=False)
-        idle_left = stand.copy()
-        idle_left.img = idle_left.img.get_transform(flip_x=True)
+        idle_left = stand.get_flipped_x()
         jump_right = jump.copy()
         jump_right.img = jump_right.img.get_transform(flip_x=False)
-        jump_left = jump.copy()
-        jump_left.img = jump_left.img.get_transform(flip_x=True)
+        jump_left = jump.get_flipped_x()
 
         walk_right_anim = ResourceAnimation(res_img_path_seq=walk_right_seq, duration=1/20, loop=True)
         walk_left_anim = ResourceAnimation(res_img_path_seq=walk_left_seq, duration=1/20, loop=True)
@@ -252,17 +467,13 @@ class PlayerImages:
         walk_right_seq = [res_img.copy() for res_img in walk_seq]
         for res_img in walk_right_seq:
             res_img.img = res_img.img.get_transform(flip_x=False)
-        walk_left_seq = [res_img.copy() for res_img in walk_seq]
-        for res_img in walk_left_seq:
-            res_img.img = res_img.img.get_transform(flip_x=True)
+        walk_left_seq = [res_img.get_flipped_x() for res_img in walk_seq]
         idle_right = stand.copy()
         idle_right.img = idle_right.img.get_transform(flip_x=False)
-        idle_left = stand.copy()
-        idle_left.img = idle_left.img.get_transform(flip_x=True)
+        idle_left = stand.get_flipped_x()
         jump_right = jump.copy()
         jump_right.img = jump_right.img.get_transform(flip_x=False)
-        jump_left = jump.copy()
-        jump_left.img = jump_left.img.get_transform(flip_x=True)
+        jump_left = jump.get_flipped_x()
 
         walk_right_anim = ResourceAnimation(res_img_path_seq=walk_right_seq, duration=1/20, loop=True)
         walk_left_anim = ResourceAnimation(res_img_path_seq=walk_left_seq, duration=1/20, loop=True)
@@ -298,17 +509,13 @@ class PlayerImages:
         walk_right_seq = [res_img.copy() for res_img in walk_seq]
         for res_img in walk_right_seq:
             res_img.img = res_img.img.get_transform(flip_x=False)
-        walk_left_seq = [res_img.copy() for res_img in walk_seq]
-        for res_img in walk_left_seq:
-            res_img.img = res_img.img.get_transform(flip_x=True)
+        walk_left_seq = [res_img.get_flipped_x() for res_img in walk_seq]
         idle_right = stand.copy()
         idle_right.img = idle_right.img.get_transform(flip_x=False)
-        idle_left = stand.copy()
-        idle_left.img = idle_left.img.get_transform(flip_x=True)
+        idle_left = stand.get_flipped_x()
         jump_right = jump.copy()
         jump_right.img = jump_right.img.get_transform(flip_x=False)
-        jump_left = jump.copy()
-        jump_left.img = jump_left.img.get_transform(flip_x=True)
+        jump_left = jump.get_flipped_x()
 
         walk_right_anim = ResourceAnimation(res_img_path_seq=walk_right_seq, duration=1/20, loop=True)
         walk_left_anim = ResourceAnimation(res_img_path_seq=walk_left_seq, duration=1/20, loop=True)
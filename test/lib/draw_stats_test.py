@@ -0,0 +1,54 @@
+import pyglet
+pyglet.options['headless'] = True
+from pyglet.window import Window
+import pytest
+
+from pyglet_utils.lib.shapes import Rectangle, RectangleBatch
+from pyglet_utils.lib.draw_stats import DrawStats, draw_stats
+
+@pytest.fixture(scope='module')
+def window():
+    window = Window(width=64, height=64, visible=False)
+    yield window
+    window.close()
+
+def count_draws(rect_batch: RectangleBatch) -> dict:
+    stats = DrawStats()
+    stats.enable()
+    try:
+        rect_batch.draw()
+        stats.next_frame()
+    finally:
+        stats.disable()
+    return stats.totals
+
+def test_contiguous_batch(window):
+    rect_batch = RectangleBatch()
+    for i in range(5):
+        rect_batch.add(x=10*i, y=0, width=5, height=5)
+    totals = count_draws(rect_batch)
+    assert totals['draw_calls'] == 1
+    assert totals['indices'] == 5 * 6
+
+def test_fragmented_batch(window):
+    # Deleting a rect splits the domain into two regions, which pyglet draws with glMultiDrawElements.
+    rect_batch = RectangleBatch()
+    rects = [rect_batch.add(x=10*i, y=0, width=5, height=5) for i in range(5)]
+    rects[2].delete()
+    totals = count_draws(rect_batch)
+    assert totals['draw_calls'] == 2
+    assert totals['indices'] == 4 * 6
+
+def test_outer_section_wins(window):
+    # Rectangle.draw opens its own section, which only counts when nothing else is open.
+    rect = Rectangle(x=0, y=0, width=5, height=5)
+    draw_stats.enable()
+    try:
+        with draw_stats.section('panel'):
+            rect.draw()
+        rect.draw()
+        draw_stats.next_frame()
+    finally:
+        draw_stats.disable()
+    assert draw_stats.last_frame['panel']['indices'] == 6
+    assert draw_stats.last_frame['rectangle']['indices'] == 6
@@ -0,0 +1,36 @@
+import pyglet
+pyglet.options['headless'] = True
+from pyglet.window import Window
+from pyglet.text import Label
+import pyglet.gl as gl
+import pytest
+
+from pyglet_utils.lib.shapes import Rectangle, RectangleBatch
+
+@pytest.fixture(scope='module')
+def window():
+    window = Window(width=64, height=64, visible=False)
+    # The projection is only set up on resize, which a hidden window never gets.
+    window.on_resize(window.width, window.height)
+    yield window
+    window.close()
+
+def read_pixel(x: int, y: int) -> tuple:
+    pixel = (gl.GLubyte * 4)()
+    gl.glReadPixels(x, y, 1, 1, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, pixel)
+    return tuple(pixel)
+
+def test_rectangle_blends_after_label(window):
+    window.switch_to()
+    gl.glClearColor(0, 0, 0, 1)
+    window.clear()
+    # Both go through gl_state before and after the label, which changes blending behind its back.
+    rect_batch = RectangleBatch()
+    rect_batch.add(x=0, y=0, width=8, height=8, color=(255,0,0), transparency=128)
+    rect_batch.batch.draw()
+    Label('0', x=32, y=32).draw()
+    Rectangle(x=16, y=0, width=8, height=8, color=(255,0,0), transparency=128).draw()
+    assert gl.glIsEnabled(gl.GL_BLEND) == gl.GL_FALSE
+    for x in [4, 20]:
+        # Drawn without blending, the red channel would be 255.
+        assert 100 < read_pixel(x, 4)[0] < 160
@@ -0,0 +1,57 @@
+import pyglet
+pyglet.options['headless'] = True
+from pyglet.window import Window
+import pytest
+from types import SimpleNamespace
+
+from pyglet_utils.platformer.debug import DebugOverlay
+from pyglet_utils.platformer.render import RenderBox
+
+@pytest.fixture(scope='module')
+def window():
+    window = Window(width=64, height=64, visible=False)
+    yield window
+    window.close()
+
+def test_set_rect_changes_color(window):
+    overlay = DebugOverlay()
+    overlay.enable_layer('contacts')
+    rect = overlay.set_rect('contacts', 0, x=0, y=0, width=5, height=5, color=(255,0,0), transparency=100)
+    assert overlay.set_rect('contacts', 0, x=0, y=0, width=5, height=5, color=(0,255,0), transparency=50) is rect
+    assert list(rect.vertex_list.colors) == [0, 255, 0, 50] * 4
+
+def test_set_rect_changes_color_of_hidden_rect(window):
+    overlay = DebugOverlay()
+    overlay.enable_layer('contacts')
+    rect = overlay.set_rect('contacts', 0, x=0, y=0, width=5, height=5, color=(255,0,0))
+    overlay.hide('contacts', 0)
+    overlay.set_rect('contacts', 0, x=0, y=0, width=5, height=5, color=(0,0,255))
+    assert rect.visible
+    assert list(rect.vertex_list.colors) == [0, 0, 255, 255] * 4
+
+def test_renderbox_debug_is_per_instance(window):
+    overlay = DebugOverlay()
+    frame = SimpleNamespace(x=0, y=0, width=100, height=100)
+    shown = RenderBox(frame=frame, debug=True, debug_overlay=overlay)
+    hidden = RenderBox(frame=frame, debug=False, debug_overlay=overlay)
+    assert shown.debug and not hidden.debug
+    assert len(overlay) == 1
+    hidden.toggle_debug()
+    shown.toggle_debug()
+    assert hidden.debug and not shown.debug
+    assert len(overlay) == 1
+
+def test_draw_only_given_layers(window):
+    overlay = DebugOverlay()
+    for layer in ['contacts', 'player']:
+        overlay.enable_layer(layer)
+        overlay.set_rect(layer, 0, x=0, y=0, width=5, height=5)
+    drawn = []
+    for layer in ['contacts', 'player']:
+        overlay.get_rect_batch(layer).draw = lambda layer=layer: drawn.append(layer)
+    overlay.draw(layers=['contacts'])
+    assert drawn == ['contacts']
+    # Removing the last rect of a layer frees its batch.
+    overlay.remove('contacts', 0)
+    overlay.draw()
+    assert drawn == ['contacts', 'player']
@@ -1,5 +1,20 @@
+import os
+import argparse
+
+from pyglet_utils.lib.asset_pipeline import MANIFEST_ENV_VAR
+
+parser = argparse.ArgumentParser(description='Walk animation test.')
+parser.add_argument(
+    '--manifest', default=None,
+    help='Asset manifest built with pyglet_utils.lib.asset_pipeline (use --flip "Player/*" for the player sprites).'
+)
+args = parser.parse_args()
+if args.manifest is not None:
+    # The resource classes are built when resources is imported, so the manifest has to be known before that.
+    os.environ[MANIFEST_ENV_VAR] = args.manifest
+
 import pyglet
-from pyglet_utils.platformer.resources import TileImages, ItemImages
+from pyglet_utils.platformer.resources import TileImages, ItemImages, AsyncImageLoader
 from pyglet.window import Window, FPSDisplay, mouse as window_mouse
 from pyglet.window import key
 from pyglet.graphics import Batch
@@ -13,6 +28,10 @@ from pyglet_utils.platformer.render import RenderBox
 from pyglet_utils.platformer.mouse import Mouse
 from pyglet_utils.platformer.game_obj import GameObjectHandler
 from pyglet_utils.platformer.map import MapMaker
+from pyglet_utils.platformer.hud import HUD
+from pyglet_utils.platformer.debug import default_debug_overlay
+from pyglet_utils.lib.draw_stats import draw_stats, DrawStatsOverlay
+from pyglet_utils.lib.retained_label import RetainedLabel
 
 # TODO: Implement map save/load.
 #       Prerequisite: Map maker
@@ -24,6 +43,7 @@ class GameWindow(Window):
         super().__init__(width=width, height=height, caption=caption)
         self.set_mouse_visible(True)
         self.fps_display = FPSDisplay(self)
+        self.draw_stats_overlay = DrawStatsOverlay(self)
         self.frame = Frame(window=self)
 
         # Create Render Box
@@ -56,12 +76,13 @@ class GameWindow(Window):
         # Create Player
         self.player = Player(x=int(0.5*self.width), y=int(0.3*self.height), frame=self.frame, grid=self.grid, renderbox=self.renderbox, debug=False)
         self.game_obj_handler.append(self.player)
-        self.player_coord_label = Label(
+        self.player_coord_label = RetainedLabel(
             text=self.grid.get_coords_str(obj_name=self.player.name),
             font_name='Times New Roman',
             font_size=15,
             x=int(0.50*self.width), y=int(0.02*self.height),
-            color=tuple([0, 255, 0] + [255])
+            color=tuple([0, 255, 0] + [255]),
+            max_updates_per_second=15
         )
 
         # Pause Related
@@ -79,9 +100,16 @@ class GameWindow(Window):
         self.mouse = Mouse(grid=self.grid, frame=self.frame)
 
         # MapMaker Related
+        self.loader = AsyncImageLoader(placeholder_size=(self.grid.tile_width, self.grid.tile_height))
         self.map_maker = MapMaker(
             frame=self.frame, renderbox=self.renderbox, grid=self.grid, mouse=self.mouse, game_obj_handler=self.game_obj_handler,
-            platform_list=[platform], block_queue=None
+            platform_list=[platform], block_queue=None, loader=self.loader
+        )
+
+        # HUD Related
+        self.hud = HUD()
+        self.queued_block_counter = self.hud.add_counter(
+            x=self.width-200, y=self.height-60, value=0, num_digits=3, icon='hud_coins'
         )
 
     def toggle_pause(self):
@@ -125,14 +153,18 @@ class GameWindow(Window):
         pass
 
     def on_draw(self):
+        draw_stats.next_frame()
         self.clear()
         self.renderbox.draw_all_renderable_objects()
         self.map_maker.draw_block_preview()
         self.grid.draw()
+        default_debug_overlay.draw()
         self.fps_display.draw()
         self.player_coord_label.draw()
+        self.hud.draw()
         if self.paused:
             self.paused_text.draw()
+        self.draw_stats_overlay.draw()
 
     def on_key_press(self, symbol, modifiers):
         if not self.paused:
@@ -167,6 +199,8 @@ class GameWindow(Window):
                 self.map_maker.toggle_block_preview_selector()
             elif symbol == key.NUM_3 or symbol == key._3:
                 self.game_obj_handler.dump_save_dict(save_path='save_dump.json', overwrite=True)
+            elif symbol == key.S:
+                draw_stats.toggle()
             elif symbol == key.P:
                 self.toggle_pause()
             elif symbol == key.ESCAPE:
@@ -216,9 +250,14 @@ class GameWindow(Window):
             self.player.move(dx=dx, dy=dy)
             self.mouse.update_grid_space()
             self.map_maker.update_block_preview()
-            self.player_coord_label.text = self.grid.get_coords_str(obj_name=self.player.name)
+            self.player_coord_label.update(
+                lambda: self.grid.get_coords_str(obj_name=self.player.name),
+                key=(self.player.x, self.player.y)
+            )
+        self.queued_block_counter.value = len(self.map_maker.block_queue.blocks)
 
     def run(self):
+        self.loader.schedule()
         pyglet.clock.schedule_interval(self.update, 1/60)
         pyglet.app.run()
 
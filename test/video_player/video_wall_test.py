@@ -0,0 +1,84 @@
+import argparse
+
+import pyglet
+from pyglet.window import Window, FPSDisplay, key
+
+from pyglet_utils.lib.video import VideoWall, open_frame_source
+
+class VideoWallWindow(Window):
+    def __init__(self, width: int, height: int, srcs: list, num_workers: int, max_fps: float, caption: str, window_fps: int):
+        super().__init__(width=width, height=height, caption=caption, resizable=True)
+        self.wall = VideoWall(
+            relative_x=0, relative_y=0, width=self.width, height=self.height,
+            parent=self, num_workers=num_workers
+        )
+        for src in srcs:
+            self.wall.add_stream(open_frame_source(src), max_fps=max_fps)
+        self.fps_display = FPSDisplay(self)
+        self.window_fps = window_fps
+        self.focused_idx = None
+
+    @property
+    def x(self) -> int:
+        return 0
+
+    @property
+    def y(self) -> int:
+        return 0
+
+    def focus(self, idx: int):
+        # The focused stream gets decoded first whenever the workers can't keep up with every stream.
+        if idx >= len(self.wall):
+            return
+        for i, video_panel in enumerate(self.wall.video_panels):
+            self.wall.set_priority(video_panel, 1 if i == idx else 0)
+        self.focused_idx = idx
+
+    def on_draw(self):
+        self.clear()
+        self.wall.draw()
+        self.fps_display.draw()
+
+    def on_key_press(self, symbol, modifiers):
+        if symbol == key.SPACE:
+            self.wall.toggle_pause()
+        elif symbol == key.ESCAPE:
+            self.close()
+        elif symbol == key.S:
+            print(self.wall.stats)
+        elif key._1 <= symbol <= key._9:
+            self.focus(symbol - key._1)
+
+    def on_resize(self, width: int, height: int):
+        self._projection.set(width, height, *self.get_framebuffer_size())
+        self.wall.shape = (width, height)
+
+    def update(self, dt):
+        self.wall.next_frame()
+
+    def on_close(self):
+        self.wall.delete()
+        super().on_close()
+
+    def run(self):
+        self.wall.start()
+        pyglet.clock.schedule_interval(self.update, 1/self.window_fps)
+        pyglet.app.run()
+
+parser = argparse.ArgumentParser(description='Play several streams in one window with a shared decoder pool.')
+parser.add_argument(
+    'srcs', nargs='*',
+    help='Video files, image directories, globs of images, or synthetic[:WxH]. Defaults to synthetic sources.'
+)
+parser.add_argument('--num-synthetic', type=int, default=9, help='Number of synthetic streams when no sources are given.')
+parser.add_argument('--workers', type=int, default=None, help='Decode threads shared by every stream. Defaults to the CPU count.')
+parser.add_argument('--max-fps', type=float, default=None, help='Decode rate cap of each stream.')
+parser.add_argument('--window-fps', type=int, default=60)
+args = parser.parse_args()
+
+srcs = args.srcs if len(args.srcs) > 0 else ['synthetic:640x360'] * args.num_synthetic
+worker = VideoWallWindow(
+    width=1200, height=800, srcs=srcs, num_workers=args.workers, max_fps=args.max_fps,
+    caption='Video Wall Test', window_fps=args.window_fps
+)
+worker.run()